@@ -5,6 +5,10 @@ Application start point.
 """
 
 import sys
+import time
+
+START_TIME = time.perf_counter()
+
 from src.Application import Application
 
 
@@ -12,7 +16,7 @@ def main():
     """
     Main function.
     """
-    result = Application.run(sys.argv)
+    result = Application.run(sys.argv, START_TIME)
     sys.exit(result)
 
 # Application start point.
@@ -4,9 +4,11 @@ Main application class.
 """
 
 import os
+import time
 from PyQt5.QtWidgets import QApplication
 from src.Tools import Tools, Config, ExecutedType
 from src.MainWindow import MainWindow
+from src.Resources import Resources
 
 
 class Application:
@@ -15,17 +17,32 @@ class Application:
     """
 
     @staticmethod
-    def run(params: list) -> int:
+    def run(params: list, start_time: float = None) -> int:
         """
         Starts the application.
+        :param params: Command line parameters.
+        :param start_time: time.perf_counter() value when the process started, used by the startup benchmark.
         :return: Error code. If no error occurred returns 0.
         """
+        if start_time is None:
+            start_time = time.perf_counter()
+
         for item in params:
-            if str(item).lower() == "--verbose":
+            param = str(item).lower()
+            if param == "--verbose":
                 Config.set_executed_type(ExecutedType.Verbose)
-                break
+            elif param == "--diagnostics":
+                Config.DIAGNOSTICS = True
+            elif param == "--startup-benchmark":
+                Config.STARTUP_BENCHMARK = True
+            elif param.startswith("--db-profile="):
+                Config.set_db_profile(param.split("=", 1)[1])
+            elif param == "--profile" or param.startswith("--profile="):
+                Config.PROFILE_PATH = str(item).split("=", 1)[1] if "=" in param else ""
 
         result = -1
+        profiler = None
+        window = None
         try:
             exec_real_path = os.path.realpath(params[0])
             exec_dir = os.path.dirname(exec_real_path)
@@ -35,14 +52,41 @@ class Application:
 
             Tools.check_paths()
 
+            if Config.PROFILE_PATH is not None:
+                from src.Profiler import Profiler
+                profiler = Profiler(Config.PROFILE_PATH or Config.LOG_PATH + time.strftime(Resources.Profiler_File_Name))
+                profiler.start()
+
             window = MainWindow()
+            if Config.STARTUP_BENCHMARK:
+                window.first_paint_signal.connect(lambda: Application.__write_startup_time(app, start_time))
             window.show()
+            if Config.DIAGNOSTICS:
+                window.show_diagnostics()
 
             result = app.exec_()
         except Exception as ex:  # wildcard for an app crash
             Tools.write_log(ex)
             result = -2
         finally:
-            Tools.write_verbose("Application error code is %s" % result)
+            if profiler is not None:
+                try:
+                    profiler.stop()
+                except OSError as ex:
+                    Tools.write_log(ex)
+
+            # written however the event loop ended, also on quit() and on a crash
+            if window is not None:
+                window.write_query_statistics()
+
+            Tools.write_verbose("Application error code is %s", result)
+            Tools.close_log()
 
         return result
+
+    @staticmethod
+    def __write_startup_time(app: QApplication, start_time: float):
+        message = Resources.Application_Startup_Time % ((time.perf_counter() - start_time) * 1000)
+        print(message)
+        Tools.write_log(message)
+        app.quit()
@@ -4,7 +4,12 @@ Class which represents database model.
 Provides methods to access and manipulate on a data.
 """
 
+import threading
+import time
+from contextlib import contextmanager
 from PyQt5.QtSql import QSqlDatabase, QSqlQuery
+from src.Diagnostics import Diagnostics
+from src.QueryStatistics import QueryStatistics
 from src.Tools import Tools, Config
 from src.Resources import Resources
 
@@ -12,14 +17,26 @@ from src.Resources import Resources
 class DbModel:
     """
     Class which represents model of the database.
+    Every thread gets its own named connection, opened on first use in that thread.
+    """
+
+    ID_LIST_CHUNK_SIZE = 100
+    """
+    Number of rows IdList is filled with by one statement. It keeps the number of bound values
+    below the oldest SQLite limit of 999.
     """
 
     def __init__(self, name: str):
+        self.__name = name
         self.__db_path = Config.DB_PATH + name
+        self.__connection = threading.local()
+        self.__statistics = QueryStatistics()
         self.__init_db()
 
     def __del__(self):
-        self.__db.close()
+        if hasattr(self.__connection, "db"):
+            self.__connection.prepared_queries.clear()
+            self.__connection.db.close()
 
     def exec(self, query_string: str) -> QSqlQuery:
         """
@@ -29,41 +46,271 @@ class DbModel:
         """
         query = self.__get_query()
         Tools.write_verbose(query_string)
+        start = time.perf_counter()
         query.exec(query_string)
+        self.__add_statistics(query, query_string, (), time.perf_counter() - start)
         Tools.write_log(query.lastError().text())
 
         return query
 
-    def __init_db(self):
-        self.__db = QSqlDatabase.addDatabase(Config.DB_TYPE)
-        self.db.setDatabaseName(self.__db_path)
+    def exec_prepared(self, template: str, *values) -> QSqlQuery:
+        """
+        Executes query prepared from a template with bound values.
+        The template is prepared once and the prepared query is reused by next calls.
+        :param template: Query template with '?' placeholders.
+        :param values: Values to bind to placeholders.
+        :return: Executed query.
+        """
+        query = self.__get_prepared_query(template)
 
-        if not self.db.isValid():
-            Tools.write_log(self.db.lastError().text())
-        if self.db.isOpenError():
-            Tools.write_log(self.db.lastError().text())
+        for position, value in enumerate(values):
+            query.bindValue(position, value)
+
+        Tools.write_verbose(template)
+        Tools.write_verbose_class_method_name(self, DbModel.exec_prepared, "values", values)
+        start = time.perf_counter()
+        query.exec()
+        self.__add_statistics(query, template, values, time.perf_counter() - start)
+        Tools.write_log(query.lastError().text())
 
-        self.db.open()
+        return query
+
+    def exec_many(self, template: str, rows: list):
+        """
+        Executes query prepared from a template once for every tuple of values.
+        All executions are done in one transaction.
+        :param template: Query template with '?' placeholders.
+        :param rows: List of tuples with values to bind.
+        """
+        with self.transaction():
+            for values in rows:
+                self.exec_prepared(template, *values)
+
+        Tools.write_verbose_class_method_name(self, DbModel.exec_many, "rows", len(rows))
+
+    def set_id_list(self, ids):
+        """
+        Fills temporary IdList table of the current connection with given ids.
+        Queries join the table to operate on a whole set of rows in one statement.
+        :param ids: Iterable of ids.
+        """
+        self.__set_id_list(Resources.DbModel_INSERT_IdList, Resources.DbModel_INSERT_IdList_Row, [(index,) for index in ids])
+
+    def set_id_value_list(self, items):
+        """
+        Fills temporary IdList table of the current connection with given ids and a value for every id.
+        :param items: Iterable of (id, value) tuples.
+        """
+        self.__set_id_list(Resources.DbModel_INSERT_IdValueList, Resources.DbModel_INSERT_IdValueList_Row,
+                           [tuple(item) for item in items])
+
+    @contextmanager
+    def transaction(self):
+        """
+        Context which executes enclosed queries in one transaction.
+        Nested contexts join the outermost transaction, which is committed when it ends
+        and rolled back if an exception is raised.
+        """
+        connection = self.__get_connection()
+        db = connection.db
+        is_outermost = connection.transaction_depth == 0
+        if is_outermost and not db.transaction():
+            Tools.write_log(db.lastError().text())
+
+        connection.transaction_depth += 1
+        try:
+            yield
+        except Exception:
+            if is_outermost and not db.rollback():
+                Tools.write_log(db.lastError().text())
+            raise
+        else:
+            if is_outermost and not db.commit():
+                Tools.write_log(db.lastError().text())
+        finally:
+            connection.transaction_depth -= 1
+
+    def close_connection(self):
+        """
+        Closes and removes connection of the current thread.
+        Worker threads should call it before they end. No query of the connection can be used afterwards.
+        """
+        if not hasattr(self.__connection, "db"):
+            return
+
+        db = self.__connection.db
+        connection_name = db.connectionName()
+        self.__connection.prepared_queries.clear()
+        del self.__connection.db
+        db.close()
+        del db
+        QSqlDatabase.removeDatabase(connection_name)
+        Tools.write_verbose_class_method_name(self, DbModel.close_connection, "connection_name", connection_name)
+
+    def __init_db(self):
         tables = self.db.tables()
 
-        if not tables:
+        if Resources.TABLE_NAME_Event not in tables:
             self.__create_db()
 
+        self.__migrate_db()
+
+    def __open_connection(self):
+        connection_name = "%s_%s_%s" % (self.__name, id(self), threading.get_ident())
+        db = QSqlDatabase.addDatabase(Config.DB_TYPE, connection_name)
+        db.setDatabaseName(self.__db_path)
+
+        if not db.isValid():
+            Tools.write_log(db.lastError().text())
+        if db.isOpenError():
+            Tools.write_log(db.lastError().text())
+
+        db.open()
+        self.__connection.db = db
+        self.__connection.prepared_queries = {}
+        self.__connection.transaction_depth = 0
+        Tools.write_verbose_class_method_name(self, DbModel.__open_connection, "connection_name", connection_name)
+        self.__apply_profile()
+        self.exec(Resources.CREATE_TEMP_TABLE_IdList)
+
+    def __get_connection(self) -> threading.local:
+        if not hasattr(self.__connection, "db"):
+            self.__open_connection()
+
+        return self.__connection
+
+    def __apply_profile(self):
+        Tools.write_verbose_class_method_name(self, DbModel.__apply_profile, "profile", Config.DB_PROFILE)
+        for name, value in Config.DB_PROFILES[Config.DB_PROFILE].items():
+            self.exec(Resources.DbModel_PRAGMA % (name, value))
+
     def __create_db(self):
         Tools.write_log("Creating tables...")
         self.exec(Resources.CREATE_TABLE_Event)
         self.exec(Resources.CREATE_TABLE_ReminderEvent)
         Tools.write_log("Done.")
 
+    def __migrate_db(self):
+        self.exec(Resources.CREATE_TABLE_SchemaVersion)
+        version = self.__get_schema_version()
+
+        for number, statements in enumerate(Resources.DbModel_Migrations[version:], version + 1):
+            Tools.write_log("Migrating database to version %s..." % number)
+            self.__check_migration(number)
+            if not self.__migrate_db_to(number, statements):
+                Tools.write_log("Migration to version %s failed." % number)
+                break
+            Tools.write_log("Done.")
+
+    def __check_migration(self, version: int):
+        check = Resources.DbModel_Migrations_Checks.get(version)
+        if check is None:
+            return
+
+        query_string, message = check
+        query = self.exec(query_string)
+        count = query.value(0) if query.next() else 0
+        query.finish()
+        if count:
+            Tools.write_log(message % count)
+
+    def __migrate_db_to(self, version: int, statements: list) -> bool:
+        try:
+            with self.transaction():
+                for statement in statements:
+                    query = self.exec(statement)
+                    if query.lastError().isValid():
+                        raise RuntimeError(query.lastError().text())
+                self.exec_prepared(Resources.DbModel_INSERT_SchemaVersion, version)
+        except RuntimeError:
+            return False
+
+        return True
+
+    def __get_schema_version(self) -> int:
+        query = self.exec_prepared(Resources.DbModel_SELECT_SchemaVersion)
+        query.next()
+        version = query.value(0)
+        query.finish()
+        if not version:
+            version = 0
+
+        Tools.write_verbose_class_method_name(self, DbModel.__get_schema_version, "version", version)
+        return int(version)
+
+    def __set_id_list(self, template: str, row_template: str, rows: list):
+        # every chunk is inserted by the same prepared statement, the last one is padded with its last row,
+        # which inserts nothing new
+        chunk_template = template % ", ".join([row_template] * DbModel.ID_LIST_CHUNK_SIZE)
+        with self.transaction():
+            self.exec_prepared(Resources.DbModel_DELETE_IdList)
+            for start in range(0, len(rows), DbModel.ID_LIST_CHUNK_SIZE):
+                chunk = rows[start:start + DbModel.ID_LIST_CHUNK_SIZE]
+                chunk += [chunk[-1]] * (DbModel.ID_LIST_CHUNK_SIZE - len(chunk))
+                self.exec_prepared(chunk_template, *[value for row in chunk for value in row])
+
+    def __add_statistics(self, query: QSqlQuery, template: str, values: tuple, duration: float):
+        # rows of a select are fetched by the caller, so only the execution and the first row are timed
+        rows_affected = -1 if query.isSelect() else query.numRowsAffected()
+        self.__statistics.add(template, duration, rows_affected)
+        Diagnostics.add_query(template, duration)
+        if duration * 1000 >= Config.SLOW_QUERY_THRESHOLD:
+            self.__write_slow_query(template, values, duration)
+
+    def __write_slow_query(self, template: str, values: tuple, duration: float):
+        query = self.__get_query()
+        plan = []
+        if query.prepare(Resources.DbModel_EXPLAIN_QUERY_PLAN % template):
+            for position, value in enumerate(values):
+                query.bindValue(position, value)
+            if query.exec():
+                while query.next():
+                    plan.append(str(query.value(3)))
+        query.finish()
+
+        Tools.write_query_log(Resources.DbModel_Slow_Query % (duration * 1000, QueryStatistics.get_short_template(template), values, "; ".join(plan)))
+
     def __get_query(self) -> QSqlQuery:
         return QSqlQuery(self.db)
 
+    def __get_prepared_query(self, template: str) -> QSqlQuery:
+        prepared_queries = self.__get_connection().prepared_queries
+        query = prepared_queries.get(template)
+        if query is None:
+            query = self.__prepare_query(template)
+            prepared_queries[template] = query
+
+        return query
+
+    def __prepare_query(self, template: str) -> QSqlQuery:
+        query = self.__get_query()
+        if not query.prepare(template):
+            Tools.write_log(query.lastError().text())
+
+        return query
+
+    @property
+    def path(self) -> str:
+        """
+        Returns path of the database file.
+        :return: File path.
+        """
+        return self.__db_path
+
+    @property
+    def statistics(self) -> QueryStatistics:
+        """
+        Returns timing statistics of queries executed by all connections.
+        :return: Query statistics.
+        """
+        return self.__statistics
+
     @property
-    def db(self):
+    def db(self) -> QSqlDatabase:
         """
-        Returns database object.
+        Returns database connection of the current thread.
         :return: Database object.
         """
-        return self.__db
+        return self.__get_connection().db
 
 
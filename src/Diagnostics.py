@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Registry of timed operations shown in the diagnostics window.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from src.Tools import Config
+
+
+class Diagnostics:
+    """
+    Keeps duration of the last run and number of runs of named operations, like refreshing or saving.
+    While recording is on, every run is also kept with its nested runs and the queries executed inside it.
+    """
+
+    __spans = {}
+    __lock = threading.Lock()
+    __records = None
+    __local = threading.local()
+
+    @staticmethod
+    @contextmanager
+    def span(name: str):
+        """
+        Context which measures the enclosed code and records it under given name.
+        :param name: Operation name.
+        """
+        start = time.perf_counter()
+        queries = None
+        if Diagnostics.__records is not None:
+            stack = Diagnostics.__get_stack()
+            depth = len(stack)
+            queries = []
+            stack.append(queries)
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            with Diagnostics.__lock:
+                count = Diagnostics.__spans.get(name, (0.0, 0))[1]
+                Diagnostics.__spans[name] = (duration, count + 1)
+
+            if queries is not None:
+                Diagnostics.__get_stack().pop()
+                with Diagnostics.__lock:
+                    records = Diagnostics.__records
+                    if records is not None and len(records) < Config.PROFILE_SPANS_LIMIT:
+                        records.append((name, depth, start, duration, queries))
+
+    @staticmethod
+    def add_query(template: str, duration: float):
+        """
+        Adds an executed query to the innermost recorded operation of the current thread.
+        Does nothing if recording is off or no operation is running.
+        :param template: Query template.
+        :param duration: Execution time in seconds.
+        """
+        if Diagnostics.__records is None:
+            return
+
+        stack = getattr(Diagnostics.__local, "stack", None)
+        if stack:
+            stack[-1].append((template, duration))
+
+    @staticmethod
+    def start_recording():
+        """
+        Starts keeping every run of operations.
+        """
+        with Diagnostics.__lock:
+            Diagnostics.__records = []
+
+    @staticmethod
+    def stop_recording() -> list:
+        """
+        Stops keeping runs of operations.
+        :return: List of tuples (name, depth, start, duration in seconds, list of tuples (template, duration)),
+        ordered by start.
+        """
+        with Diagnostics.__lock:
+            records = Diagnostics.__records or []
+            Diagnostics.__records = None
+
+        records.sort(key=lambda record: record[2])
+        return records
+
+    @staticmethod
+    def get_spans() -> dict:
+        """
+        Returns recorded operations.
+        :return: Dict of operation name to tuple (last duration in seconds, number of runs).
+        """
+        with Diagnostics.__lock:
+            return dict(Diagnostics.__spans)
+
+    @staticmethod
+    def clear():
+        """
+        Removes all recorded operations.
+        """
+        with Diagnostics.__lock:
+            Diagnostics.__spans.clear()
+
+    @staticmethod
+    def __get_stack() -> list:
+        stack = getattr(Diagnostics.__local, "stack", None)
+        if stack is None:
+            stack = []
+            Diagnostics.__local.stack = stack
+        return stack
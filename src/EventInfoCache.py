@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Cache of event data used to add next reminders.
+"""
+
+import threading
+from collections import OrderedDict
+from src.Tools import Tools, Config
+
+
+class EventInfo:
+    """
+    Event data needed to add next reminders, with the number of its pending reminders.
+    """
+
+    __slots__ = ("start_date", "is_cyclic", "count", "day", "month", "is_active", "reminder_count")
+
+    def __init__(self, start_date: int, is_cyclic: bool, count: int, day: int, month: int, is_active: bool, reminder_count: int):
+        self.start_date = start_date
+        self.is_cyclic = is_cyclic
+        self.count = count
+        self.day = day
+        self.month = month
+        self.is_active = is_active
+        self.reminder_count = reminder_count
+
+
+class EventInfoCache:
+    """
+    Bounded cache of event infos keyed by event Id. The least recently used info is evicted first.
+    Whoever changes an event or its reminders must invalidate the event's info.
+    """
+
+    def __init__(self, size: int = Config.EVENT_INFO_CACHE_SIZE):
+        self.__size = size
+        self.__items = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    def get(self, event_id: int) -> EventInfo:
+        """
+        Returns cached info of an event.
+        :param event_id: Event Id.
+        :return: Event info or None if not cached.
+        """
+        with self.__lock:
+            info = self.__items.get(event_id)
+            if info is None:
+                self.__misses += 1
+            else:
+                self.__hits += 1
+                self.__items.move_to_end(event_id)
+
+            return info
+
+    def put(self, event_id: int, info: EventInfo):
+        """
+        Stores info of an event.
+        :param event_id: Event Id.
+        :param info: Event info.
+        """
+        with self.__lock:
+            self.__items[event_id] = info
+            self.__items.move_to_end(event_id)
+            if len(self.__items) > self.__size:
+                self.__items.popitem(last=False)
+
+    def invalidate(self, event_id: int):
+        """
+        Removes info of an event.
+        :param event_id: Event Id.
+        """
+        with self.__lock:
+            self.__items.pop(event_id, None)
+
+        Tools.write_verbose_class_method_name(self, EventInfoCache.invalidate, "event_id", event_id)
+
+    def clear(self):
+        """
+        Removes all infos.
+        """
+        with self.__lock:
+            self.__items.clear()
+
+    @property
+    def hits(self) -> int:
+        """
+        Returns number of successful lookups.
+        :return: Number of hits.
+        """
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """
+        Returns number of failed lookups.
+        :return: Number of misses.
+        """
+        return self.__misses
@@ -6,6 +6,7 @@ Manager to operate on event data.
 from PyQt5.QtCore import Qt, QVariant, QModelIndex
 from PyQt5.QtSql import QSqlTableModel, QSqlRecord
 from src.DbModel import DbModel
+from src.EventInfoCache import EventInfoCache
 from src.Resources import Resources
 from src.Tools import Tools
 
@@ -15,16 +16,25 @@ class EventManager:
     Manager to manage event logic.
     """
 
-    def __init__(self, db: DbModel):
+    def __init__(self, db: DbModel, event_info_cache: EventInfoCache):
         self.__db = db
+        self.__event_info_cache = event_info_cache
         self.__model = QSqlTableModel(None, self.__db.db)
         self.model.setTable(Resources.TABLE_NAME_Event)
         self.model.setEditStrategy(QSqlTableModel.OnManualSubmit)
         self.model.beforeInsert.connect(self.__before_insert)
         self.model.beforeUpdate.connect(self.__before_update)
         self.model.beforeDelete.connect(self.__before_delete)
+        self.model.dataChanged.connect(self.__data_changed)
+        self.model.modelReset.connect(self.__model_reset)
         self.__last_id = self.__get_last_id()
         self.__added_items = []
+        self.__changed_ids = set()
+        self.__old_records = {}
+        self.__added_counts = {}
+        self.__removed_counts = {}
+        self.__deactivated_ids = []
+        self.__deleted_ids = []
 
     def insert_row(self) -> int:
         """
@@ -34,25 +44,56 @@ class EventManager:
         rows_count = self.model.rowCount()
         new_record = self.__get_new_record()
         self.model.insertRecord(rows_count, new_record)
-        Tools.write_verbose_class_name(self, "Row inserted at position %s" % rows_count)
+        Tools.write_verbose_class_name(self, "Row inserted at position %s", rows_count)
         return rows_count
 
     def remove_rows(self, selected_indexes: list):
         """
-        Delete selected rows.
+        Delete selected rows. Events and their reminders are deleted from the database on save.
         :param selected_indexes Selected rows' indexes.
         """
-        for item in selected_indexes:
-            self.__remove_row(item)
-            Tools.write_verbose_class_name(self, "Row with id = %s removed" % item)
+        rows = sorted({item.row() for item in selected_indexes if item.isValid()}, reverse=True)
+        for row in rows:
+            self.__remove_row(row)
+        Tools.write_verbose_class_method_name(self, EventManager.remove_rows, "rows", rows)
 
     def save(self):
         """
         Saves changes.
+        Old values of changed events are read in one query before the model is submitted. Reminders are
+        added or deleted after it, with one statement per kind of change.
         """
-        self.model.submitAll()
+        try:
+            with self.__db.transaction():
+                self.__old_records = self.__get_old_records(self.__changed_ids.difference(self.__added_items))
+                self.model.submitAll()
+                self.__apply_reminder_changes()
+        finally:
+            self.__old_records = {}
+            self.__added_counts = {}
+            self.__removed_counts = {}
+            self.__deactivated_ids = []
+            self.__deleted_ids = []
         Tools.write_verbose_class_name(self, "Model saved")
 
+    def set_search(self, text: str):
+        """
+        Limits model to events which names match given text and reselects it. Unsaved changes are discarded.
+        The match is written into the filter as an SQL string literal, the model has no way to bind it.
+        :param text: Searched text. Empty text shows all events.
+        """
+        match = Tools.get_search_match(text)
+        self.model.setFilter("" if match is None else Resources.EventManager_FILTER_Search % match.replace("'", "''"))
+        self.model.select()
+        Tools.write_verbose_class_method_name(self, EventManager.set_search, "search", match)
+
+    def is_dirty(self) -> bool:
+        """
+        Returns whether model has unsaved changes.
+        :return: True if there are unsaved changes.
+        """
+        return self.model.isDirty()
+
     def set_header_title(self, column: int, title: str):
         """
         Sets title for a column.
@@ -61,46 +102,64 @@ class EventManager:
         """
         self.model.setHeaderData(column, Qt.Horizontal, title)
 
+    def __data_changed(self, top_left: QModelIndex, bottom_right: QModelIndex):
+        columns = range(top_left.column(), bottom_right.column() + 1)
+        if Resources.EventManager_Column_Count_Index not in columns and Resources.EventManager_Column_IsActive_Index not in columns:
+            return
+
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            self.__changed_ids.add(self.model.record(row).value(0))
+
+    def __model_reset(self):
+        self.__changed_ids.clear()
+
     def __before_insert(self, record: QSqlRecord):
         index = record.value(0)
-        self.__insert_reminder_events(record)
+        self.__event_info_cache.invalidate(index)
+        if record.value(Resources.EventManager_Column_IsActive_Index):
+            self.__added_counts[index] = record.value(Resources.EventManager_Column_Count_Index)
         self.__added_items.remove(index)
-        Tools.write_verbose_class_method_name(self, EventManager.__before_insert, "added_items.remove", str(index))
-        Tools.write_verbose_class_method_name(self, EventManager.__before_insert, "added_items.remained", str(self.__added_items))
+        Tools.write_verbose_class_method_name(self, EventManager.__before_insert, "added_items.remove", index)
+        Tools.write_verbose_class_method_name(self, EventManager.__before_insert, "added_items.remained", self.__added_items)
 
     def __before_update(self, row: int, record: QSqlRecord):
         del row
         index = record.value(0)
-        query = self.__db.exec(Resources.EventManager_SELECT_Event % index)
-        query.next()
-        old_record = query.record()
-        self.__update_active(old_record, record)
-        self.__update_count(old_record, record)
-        Tools.write_verbose_class_method_name(self, EventManager.__before_update, "updated", str(index))
+        self.__event_info_cache.invalidate(index)
+        # only changed fields are generated in the record
+        if record.isGenerated(Resources.EventManager_Column_Count_Index) or record.isGenerated(Resources.EventManager_Column_IsActive_Index):
+            old_record = self.__old_records.get(index)
+            if old_record is None:  # the change was not tracked
+                old_record = self.__get_old_records([index]).get(index)
+            if old_record is not None:
+                self.__update_reminder_changes(index, old_record, record)
+
+        Tools.write_verbose_class_method_name(self, EventManager.__before_update, "updated", index)
 
     def __before_delete(self, row: int):
+        # the model deletes the event row itself, reminders of all deleted events are deleted after it
         record = self.model.record(row)
         index = record.value(0)
-        self.__db.exec(Resources.EventManager_DELETE_ReminderEvent % index)
-        self.__db.exec(Resources.EventManager_DELETE_Event % index)
-        Tools.write_verbose_class_method_name(self, EventManager.__before_delete, "deleted", str(index))
+        self.__event_info_cache.invalidate(index)
+        self.__deleted_ids.append(index)
+        Tools.write_verbose_class_method_name(self, EventManager.__before_delete, "deleted", index)
 
-    def __remove_row(self, item: QModelIndex):
-        row_number = item.row()
+    def __remove_row(self, row_number: int):
         record = self.model.record(row_number)
         index = record.value(0)
 
         self.model.removeRow(row_number)
         if index in self.__added_items:  # the row was not saved in the database
             self.__added_items.remove(index)
-            Tools.write_verbose_class_method_name(self, EventManager.__remove_row, "added_items.remove", str(index))
-            Tools.write_verbose_class_method_name(self, EventManager.__remove_row, "added_items.remained", str(self.__added_items))
+            Tools.write_verbose_class_method_name(self, EventManager.__remove_row, "added_items.remove", index)
+            Tools.write_verbose_class_method_name(self, EventManager.__remove_row, "added_items.remained", self.__added_items)
 
     def __get_new_record(self) -> QSqlRecord:
         record = self.model.record()
         self.__set_next_id(record)
         for key, value in Resources.EventManager_Columns_Default_Values.items():
             record.setValue(key, QVariant(value))
+        record.setValue(Resources.EventManager_Column_StartDate_Index, QVariant(Tools.get_current_day()))
 
         return record
 
@@ -113,61 +172,67 @@ class EventManager:
         record.setValue(0, QVariant(new_id))
         self.__added_items.append(new_id)
         self.__last_id = new_id
-        Tools.write_verbose_class_method_name(self, EventManager.__set_next_id, "new_id", str(new_id))
+        Tools.write_verbose_class_method_name(self, EventManager.__set_next_id, "new_id", new_id)
 
     def __get_last_id(self) -> int:
-        query = self.__db.exec(Resources.EventManager_SELECT_MaxId)
+        query = self.__db.exec_prepared(Resources.EventManager_SELECT_MaxId)
         query.next()
         index = query.value(0)
+        query.finish()
         if not index:
             index = 0
 
-        Tools.write_verbose_class_method_name(self, EventManager.__get_last_id, "last_id", str(index))
+        Tools.write_verbose_class_method_name(self, EventManager.__get_last_id, "last_id", index)
         return int(index)
 
-    def __insert_reminder_events(self, record: QSqlRecord):
-        index = record.value(0)
-        start_date = record.value(Resources.EventManager_Column_StartDate_Index)
-        count = record.value(Resources.EventManager_Column_Count_Index)
-        Tools.write_verbose_class_method_name(self, EventManager.__insert_reminder_events, "event_id", str(index))
-        self.__insert_missing_reminder_events(index, start_date, count)
-
-    def __insert_missing_reminder_events(self, event_id: int, start_date: str, count: int):
-        for i in range(count):
-            sql = Resources.Manager_INSERT_ReminderEvent % (event_id, start_date)
-            self.__db.exec(sql)
-
-    def __update_active(self, old_record: QSqlRecord, new_record: QSqlRecord):
-        new_value = bool(new_record.value(Resources.EventManager_Column_IsActive_Index))
-        if bool(old_record.value(Resources.EventManager_Column_IsActive_Index)) == new_value:
-            return
-
-        index = old_record.value(0)
-        Tools.write_verbose_class_method_name(self, EventManager.__update_active, "event_id", str(index))
-
-        if new_value is False:  # if change to inactive
-            sql = Resources.Manager_DELETE_ReminderEvent % index
-            self.__db.exec(sql)
-        else:  # if change to active
-            self.__insert_reminder_events(new_record)
-
-    def __update_count(self, old_record: QSqlRecord, new_record: QSqlRecord):
-        new_value = new_record.value(Resources.EventManager_Column_Count_Index)
-        old_value = old_record.value(Resources.EventManager_Column_Count_Index)
-        if new_value == old_value:
+    def __get_old_records(self, event_ids) -> dict:
+        if not event_ids:
+            return {}
+
+        self.__db.set_id_list(event_ids)
+        query = self.__db.exec_prepared(Resources.EventManager_SELECT_EventIdList)
+        result = {}
+        while query.next():
+            # NULL count, which PyQt returns as an empty string, means no reminders
+            result[query.value(0)] = (0 if query.isNull(1) else int(query.value(1)), bool(query.value(2)))
+        query.finish()
+
+        Tools.write_verbose_class_method_name(self, EventManager.__get_old_records, "old_records", len(result))
+        return result
+
+    def __update_reminder_changes(self, index: int, old_record: tuple, new_record: QSqlRecord):
+        old_count, old_active = old_record
+        new_count = new_record.value(Resources.EventManager_Column_Count_Index)
+        new_active = bool(new_record.value(Resources.EventManager_Column_IsActive_Index))
+
+        if old_active and not new_active:  # if change to inactive
+            self.__deactivated_ids.append(index)
+        elif new_active and not old_active:  # if change to active
+            self.__added_counts[index] = new_count
+        elif new_active and new_count > old_count:  # we need to add missing records
+            self.__added_counts[index] = new_count - old_count
+        elif new_active and new_count < old_count:  # we need to delete redundant records
+            self.__removed_counts[index] = old_count - new_count
+        else:
             return
 
-        index = new_record.value(0)
-        Tools.write_verbose_class_method_name(self, EventManager.__update_count, "event_id", str(index))
-
-        if new_value > old_value:  # we need to add missing records
-            start_date = new_record.value(Resources.EventManager_Column_StartDate_Index)
-            count = new_value - old_value
-            self.__insert_missing_reminder_events(index, start_date, count)
-        else:  # we need to delete redundant records
-            count = old_value - new_value
-            sql = Resources.EventManager_DELETE_Newest_ReminderEvents % (index, count)
-            self.__db.exec(sql)
+        Tools.write_verbose_class_method_name(self, EventManager.__update_reminder_changes, "event_id", index)
+
+    def __apply_reminder_changes(self):
+        if self.__deleted_ids:
+            self.__db.set_id_list(self.__deleted_ids)
+            self.__db.exec_prepared(Resources.EventManager_DELETE_ReminderEventIdList)
+        if self.__deactivated_ids:
+            self.__db.set_id_list(self.__deactivated_ids)
+            self.__db.exec_prepared(Resources.Manager_DELETE_ReminderEventIdList)
+        if self.__removed_counts:
+            self.__db.set_id_value_list(self.__removed_counts.items())
+            self.__db.exec_prepared(Resources.EventManager_DELETE_Newest_ReminderEventIdValueList)
+        if self.__added_counts:
+            self.__db.set_id_value_list(self.__added_counts.items())
+            self.__db.exec_prepared(Resources.EventManager_INSERT_ReminderEventIdValueList)
+
+        Tools.write_verbose_class_method_name(self, EventManager.__apply_reminder_changes, "added_counts", len(self.__added_counts))
 
     @property
     def model(self):
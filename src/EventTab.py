@@ -3,15 +3,17 @@
 Tab for editing events.
 """
 
-from PyQt5.QtCore import QVariant, pyqtSignal
-from PyQt5.QtWidgets import QWidget, QTableView, QVBoxLayout, QHBoxLayout, QPushButton, QMessageBox, QAbstractItemView
-from src.CheckBoxEdit import CheckBoxEdit
+from PyQt5.QtCore import QTimer, pyqtSignal
+from PyQt5.QtWidgets import QWidget, QTableView, QVBoxLayout, QHBoxLayout, QPushButton, QMessageBox, QAbstractItemView, QLineEdit
 from src.DbModel import DbModel
+from src.Diagnostics import Diagnostics
+from src.EventInfoCache import EventInfoCache
 from src.EventManager import EventManager
+from src.ItemDelegateCheckBox import ItemDelegateCheckBox
 from src.ItemDelegateDateEdit import ItemDelegateDateEdit
 from src.ItemDelegateSpinBoxEdit import ItemDelegateSpinBoxEdit
 from src.Resources import Resources
-from src.Tools import Tools
+from src.Tools import Tools, Config
 
 
 class EventTab(QWidget):
@@ -21,22 +23,24 @@ class EventTab(QWidget):
 
     save_clicked_signal = pyqtSignal()
 
-    def __init__(self, db: DbModel):
+    def __init__(self, db: DbModel, event_info_cache: EventInfoCache):
         super(EventTab, self).__init__()
-        self.__manager = EventManager(db)
-        self.__manager.model.select()
+        with Diagnostics.span(Resources.Diagnostics_SPAN_Event_Load):
+            self.__manager = EventManager(db, event_info_cache)
+            self.__manager.model.select()
         self.__create_view()
         self.setLayout(self.__layout)
 
     def __create_view(self):
         self.__view = QTableView()
         self.__view.setModel(self.__manager.model)
-        self.__view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.__view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.__view.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.__layout = QVBoxLayout()
+        self.__layout.addWidget(self.__create_search())
         self.__layout.addWidget(self.__view)
         self.__layout.addLayout(self.__create_buttons())
         self.__set_columns_delegate()
-        self.__set_columns_checkbox([Resources.EventManager_Column_IsCyclic_Index, Resources.EventManager_Column_IsActive_Index])
         self.__set_columns_visible()
         self.__set_columns_width()
         self.__set_columns_title()
@@ -46,24 +50,38 @@ class EventTab(QWidget):
         self.__delegate_number = ItemDelegateSpinBoxEdit(1)
         self.__delegate_days = ItemDelegateSpinBoxEdit()
         self.__delegate_months = ItemDelegateSpinBoxEdit()
+        self.__delegate_check_box = ItemDelegateCheckBox()
         self.__view.setItemDelegateForColumn(2, self.__delegate_start_date)
         self.__view.setItemDelegateForColumn(4, self.__delegate_number)
         self.__view.setItemDelegateForColumn(5, self.__delegate_days)
         self.__view.setItemDelegateForColumn(6, self.__delegate_months)
-
-    def __set_columns_checkbox(self, column_list: list):
-        for column in column_list:
-            for row in range(self.__manager.model.rowCount()):
-                self.__set_column_checkbox(row, column)
-
-    def __set_column_checkbox(self, row: int, column: int):
-        index = self.__manager.model.index(row, column)
-        check_box = CheckBoxEdit(None)
-        check_box.set_property(Resources.EventTab_Property_Row, QVariant(row))
-        check_box.set_property(Resources.EventTab_Property_Column, QVariant(column))
-        check_box.state_changed.connect(self.__checkbox_clicked)
-        check_box.checked = bool(index.data())
-        self.__view.setIndexWidget(index, check_box)
+        self.__view.setItemDelegateForColumn(Resources.EventManager_Column_IsCyclic_Index, self.__delegate_check_box)
+        self.__view.setItemDelegateForColumn(Resources.EventManager_Column_IsActive_Index, self.__delegate_check_box)
+
+    def __create_search(self):
+        self.__search_text = ""
+        self.__search_edit = QLineEdit(self)
+        self.__search_edit.setPlaceholderText(Resources.EventTab_Search_Placeholder)
+        self.__search_timer = QTimer(self)
+        self.__search_timer.setSingleShot(True)
+        self.__search_timer.setInterval(Config.SEARCH_DELAY)
+        self.__search_timer.timeout.connect(self.__search)
+        self.__search_edit.textChanged.connect(self.__search_timer.start)
+
+        return self.__search_edit
+
+    def __search(self):
+        if self.__manager.is_dirty():
+            reply = QMessageBox.warning(self, Resources.EventTab_Search_Placeholder, Resources.EventTab_Search_Message, QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply == QMessageBox.No:  # the box shows the search the view is filtered by again
+                self.__search_edit.blockSignals(True)
+                self.__search_edit.setText(self.__search_text)
+                self.__search_edit.blockSignals(False)
+                return
+
+        self.__search_text = self.__search_edit.text()
+        with Diagnostics.span(Resources.Diagnostics_SPAN_Event_Search):
+            self.__manager.set_search(self.__search_text)
 
     def __create_buttons(self):
         self.__add_button = self.__create_button(Resources.EventTab_BUTTON_NAME_Add, self.__add_clicked)
@@ -97,29 +115,20 @@ class EventTab(QWidget):
         for key, value in Resources.EventTab_Columns_Names.items():
             self.__manager.set_header_title(key, value)
 
-    def __checkbox_clicked(self, state: int):
-        del state
-        sender = self.sender()
-        row = int(sender.property(Resources.EventTab_Property_Row))
-        column = int(sender.property(Resources.EventTab_Property_Column))
-        index = self.__manager.model.index(row, column)
-        self.__manager.model.setData(index, sender.isChecked())
-
     def __add_clicked(self):
-        index = self.__manager.insert_row()
-        self.__set_column_checkbox(index, Resources.EventManager_Column_IsCyclic_Index)
-        self.__set_column_checkbox(index, Resources.EventManager_Column_IsActive_Index)
+        self.__manager.insert_row()
 
     def __delete_clicked(self):
         reply = QMessageBox.warning(self, Resources.EventTab_BUTTON_NAME_Delete, Resources.EventTab_Delete_Message, QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
         if reply == QMessageBox.No:
             return
 
-        selected_indexes = self.__view.selectedIndexes()
+        selected_indexes = self.__view.selectionModel().selectedRows()
         self.__manager.remove_rows(selected_indexes)
 
     def __save_clicked(self):
-        self.__manager.save()
-        self.__set_columns_checkbox([Resources.EventManager_Column_IsCyclic_Index, Resources.EventManager_Column_IsActive_Index])
+        with Diagnostics.span(Resources.Diagnostics_SPAN_Event_Save):
+            self.__manager.save()
+        self.__delegate_start_date.reset_minimum()
         self.save_clicked_signal.emit()
         Tools.write_verbose_class_name(self, "Save clicked")
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Delegate painting a push button in a cell.
+"""
+
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem, QStyleOptionButton, QStyle, QApplication
+from PyQt5.QtCore import Qt, QEvent, QModelIndex, QPersistentModelIndex, QAbstractItemModel, pyqtSignal
+from PyQt5.QtGui import QPainter
+from src.Tools import Tools
+
+
+class ItemDelegateButton(QStyledItemDelegate):
+    """
+    Delegate class which paints a push button instead of creating a widget for every row.
+    Clicks are handled in editorEvent.
+    """
+
+    clicked_signal = pyqtSignal(QModelIndex)
+    """
+    Emitted with the cell's index when the painted button is clicked.
+    """
+
+    def __init__(self, text: str):
+        super(ItemDelegateButton, self).__init__(None)
+        self.__text = text
+        self.__pressed = QPersistentModelIndex()
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        """
+        Paints the button.
+        :param painter: Painter.
+        :param option: Options.
+        :param index: Model's index.
+        """
+        button = QStyleOptionButton()
+        button.rect = option.rect
+        button.text = self.__text
+        button.state = QStyle.State_Enabled
+        button.state |= QStyle.State_Sunken if self.__pressed == index else QStyle.State_Raised
+        style = option.widget.style() if option.widget is not None else QApplication.style()
+        style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
+
+    def editorEvent(self, event: QEvent, model: QAbstractItemModel, option: QStyleOptionViewItem, index: QModelIndex) -> bool:
+        """
+        Handles mouse events of the button.
+        :param event: Event.
+        :param model: Model.
+        :param option: Options.
+        :param index: Model's index.
+        :return: True if the event was handled.
+        """
+        if event.type() not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease, QEvent.MouseButtonDblClick):
+            return False
+        if event.button() != Qt.LeftButton:
+            return False
+
+        is_inside = option.rect.contains(event.pos())
+        if event.type() == QEvent.MouseButtonRelease:
+            is_clicked = is_inside and self.__pressed == index
+            self.__pressed = QPersistentModelIndex()
+            self.__update(option)
+            if is_clicked:
+                Tools.write_verbose_class_method_name(self, ItemDelegateButton.editorEvent, "row", index.row())
+                self.clicked_signal.emit(index)
+            return True
+
+        if is_inside:
+            self.__pressed = QPersistentModelIndex(index)
+            self.__update(option)
+
+        return True
+
+    @staticmethod
+    def __update(option: QStyleOptionViewItem):
+        if option.widget is not None:
+            option.widget.viewport().update(option.rect)
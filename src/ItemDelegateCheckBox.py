@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Delegate painting a check box in a cell.
+"""
+
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem, QStyleOptionButton, QStyle, QApplication, QWidget
+from PyQt5.QtCore import Qt, QEvent, QModelIndex, QAbstractItemModel, QRect
+from PyQt5.QtGui import QPainter
+from src.Tools import Tools
+
+
+class ItemDelegateCheckBox(QStyledItemDelegate):
+    """
+    Delegate class which paints a centered check box instead of creating a widget for every row.
+    Clicks and space key toggle the value in editorEvent.
+    """
+
+    def __init__(self):
+        super(ItemDelegateCheckBox, self).__init__(None)
+
+    def createEditor(self, parent: QWidget, options: QStyleOptionViewItem, index: QModelIndex) -> QWidget:
+        """
+        Creates no editor, the value is toggled in place.
+        :param parent: Parent widget.
+        :param options: Options.
+        :param index: Model's index.
+        :return: None.
+        """
+        return None
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        """
+        Paints the check box.
+        :param painter: Painter.
+        :param option: Options.
+        :param index: Model's index.
+        """
+        style = ItemDelegateCheckBox.__get_style(option)
+        style.drawPrimitive(QStyle.PE_PanelItemViewItem, option, painter, option.widget)
+        check_box = QStyleOptionButton()
+        check_box.rect = ItemDelegateCheckBox.__get_check_box_rect(option)
+        check_box.state = QStyle.State_Enabled
+        check_box.state |= QStyle.State_On if bool(index.data()) else QStyle.State_Off
+        style.drawControl(QStyle.CE_CheckBox, check_box, painter, option.widget)
+
+    def editorEvent(self, event: QEvent, model: QAbstractItemModel, option: QStyleOptionViewItem, index: QModelIndex) -> bool:
+        """
+        Toggles the value on click or space key.
+        :param event: Event.
+        :param model: Model.
+        :param option: Options.
+        :param index: Model's index.
+        :return: True if the event was handled.
+        """
+        if event.type() in (QEvent.MouseButtonPress, QEvent.MouseButtonDblClick):
+            return event.button() == Qt.LeftButton and ItemDelegateCheckBox.__get_check_box_rect(option).contains(event.pos())
+        if event.type() == QEvent.MouseButtonRelease:
+            if event.button() != Qt.LeftButton or not ItemDelegateCheckBox.__get_check_box_rect(option).contains(event.pos()):
+                return False
+        elif event.type() == QEvent.KeyPress:
+            if event.key() not in (Qt.Key_Space, Qt.Key_Select):
+                return False
+        else:
+            return False
+
+        value = not bool(index.data())
+        model.setData(index, value)
+        Tools.write_verbose_class_method_name(self, ItemDelegateCheckBox.editorEvent, "value", value)
+        return True
+
+    @staticmethod
+    def __get_check_box_rect(option: QStyleOptionViewItem) -> QRect:
+        check_box = QStyleOptionButton()
+        rect = ItemDelegateCheckBox.__get_style(option).subElementRect(QStyle.SE_CheckBoxIndicator, check_box, option.widget)
+        rect.moveCenter(option.rect.center())
+        return rect
+
+    @staticmethod
+    def __get_style(option: QStyleOptionViewItem) -> QStyle:
+        return option.widget.style() if option.widget is not None else QApplication.style()
@@ -12,6 +12,7 @@ from src.Resources import Resources
 class ItemDelegateDateEdit(QStyledItemDelegate):
     """
     Delegate class with DateEdit as an editor.
+    A date can not be edited to a day before the one it had when its event was first edited since the last reset.
     """
 
     def __init__(self):
@@ -36,15 +37,15 @@ class ItemDelegateDateEdit(QStyledItemDelegate):
         :param editor: Editor.
         :param index: Model's index.
         """
-        date = Tools.get_date_from_string(str(index.data()))
-        row = index.row()
+        date = Tools.get_date_from_day(index.data())
+        event_id = index.sibling(index.row(), 0).data()
 
-        if row not in self.__minimum:
-            self.__minimum[row] = date
+        if event_id not in self.__minimum:
+            self.__minimum[event_id] = date
 
-        editor.setMinimumDate(self.__minimum[row])
+        editor.setMinimumDate(self.__minimum[event_id])
         editor.setDate(date)
-        Tools.write_verbose_class_method_name(self, ItemDelegateDateEdit.setEditorData, "date", str(date))
+        Tools.write_verbose_class_method_name(self, ItemDelegateDateEdit.setEditorData, "date", date)
 
     def setModelData(self, editor: QWidget, model: QAbstractItemModel, index: QModelIndex):
         """
@@ -53,9 +54,9 @@ class ItemDelegateDateEdit(QStyledItemDelegate):
         :param model: Model.
         :param index: Model's index.
         """
-        date = editor.date().toString(Resources.FORMAT_DATE_STORE)
+        date = editor.date().toJulianDay()
         model.setData(index, date)
-        Tools.write_verbose_class_method_name(self, ItemDelegateDateEdit.setModelData, "date", str(date))
+        Tools.write_verbose_class_method_name(self, ItemDelegateDateEdit.setModelData, "date", date)
 
     def displayText(self, value: QVariant, locale: QLocale) -> str:
         """
@@ -64,5 +65,10 @@ class ItemDelegateDateEdit(QStyledItemDelegate):
         :param locale: Locale format.
         :return: Text to display.
         """
-        date = Tools.get_date_from_string(str(value))
-        return date.toString(Resources.FORMAT_DATE_DISPLAY)
+        return Tools.get_display_date(value)
+
+    def reset_minimum(self):
+        """
+        Forgets minimal dates of edited events, e.g. after their dates were saved.
+        """
+        self.__minimum.clear()
@@ -37,7 +37,7 @@ class ItemDelegateSpinBoxEdit(QStyledItemDelegate):
         """
         value = index.data()
         editor.setValue(value)
-        Tools.write_verbose_class_method_name(self, ItemDelegateSpinBoxEdit.setEditorData, "value", str(value))
+        Tools.write_verbose_class_method_name(self, ItemDelegateSpinBoxEdit.setEditorData, "value", value)
 
     def setModelData(self, editor: QWidget, model: QAbstractItemModel, index: QModelIndex):
         """
@@ -48,7 +48,7 @@ class ItemDelegateSpinBoxEdit(QStyledItemDelegate):
         """
         value = editor.value()
         model.setData(index, value)
-        Tools.write_verbose_class_method_name(self, ItemDelegateSpinBoxEdit.setModelData, "value", str(value))
+        Tools.write_verbose_class_method_name(self, ItemDelegateSpinBoxEdit.setModelData, "value", value)
 
     def displayText(self, value: QVariant, locale: QLocale) -> str:
         """
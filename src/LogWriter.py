@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Background writer of the log file.
+"""
+
+import gzip
+import os
+import queue
+import shutil
+import sys
+import threading
+from datetime import date
+
+
+class LogWriter(threading.Thread):
+    """
+    Thread writing queued messages to the daily log file. The file is kept open and flushed once per batch
+    of messages. A new file is started every day and when the current one exceeds the maximal size,
+    old files are compressed with gzip.
+    Files are named by the writer's name and day, so several writers can share the log directory.
+    """
+
+    FILE_NAME = "%s_%s.log"
+    FILE_NAME_ROTATED = "%s_%s.%s.log"
+    FORMAT_DAY = "%Y_%m_%d"
+    BATCH_SIZE = 1000
+    """
+    Maximal number of messages written between two flushes.
+    """
+
+    def __init__(self, log_dir: str, max_size: int, name: str = "log"):
+        super(LogWriter, self).__init__(name="LogWriter-" + name, daemon=True)
+        self.__log_dir = log_dir
+        self.__name = name
+        self.__max_size = max_size
+        self.__queue = queue.Queue()
+        self.__file = None
+        self.__day = None
+
+    def write(self, message: str):
+        """
+        Queues message to be written. Returns immediately.
+        :param message: Message with a line end.
+        """
+        self.__queue.put(message)
+
+    def close(self, timeout: float = 5.0):
+        """
+        Writes all queued messages, closes the file and stops the thread.
+        :param timeout: Maximal time in seconds to wait for the thread.
+        """
+        self.__queue.put(None)
+        self.join(timeout)
+
+    def run(self):
+        """
+        Writes messages until the writer is closed.
+        """
+        try:
+            self.__compress_old_files()
+        except OSError as ex:  # the log directory can not be listed, old files stay as they are
+            print("Could not compress old logs: %s" % ex, file=sys.stderr)
+
+        is_running = True
+        while is_running:
+            messages = [self.__queue.get()]
+            while len(messages) < LogWriter.BATCH_SIZE:
+                try:
+                    messages.append(self.__queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if None in messages:
+                messages = messages[:messages.index(None)]
+                is_running = False
+
+            try:
+                self.__write(messages)
+            except OSError as ex:  # the log itself can not be written, so the error is only printed
+                print("Could not write log: %s" % ex, file=sys.stderr)
+
+        self.__close_file()
+
+    def __write(self, messages: list):
+        if not messages:
+            return
+
+        self.__rotate()
+        self.__file.write("".join(messages))
+        self.__file.flush()
+
+    def __rotate(self):
+        day = date.today().strftime(LogWriter.FORMAT_DAY)
+        if self.__file is not None and day != self.__day:
+            self.__close_file()
+            LogWriter.__try_compress(self.__get_path(self.__day))
+        elif self.__file is not None and self.__file.tell() >= self.__max_size:
+            self.__close_file()
+            rotated_path = self.__get_rotated_path(day)
+            os.replace(self.__get_path(day), rotated_path)
+            LogWriter.__try_compress(rotated_path)
+
+        if self.__file is None:
+            self.__day = day
+            self.__file = open(self.__get_path(day), "a", encoding="utf-8")
+
+    def __close_file(self):
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def __compress_old_files(self):
+        current_name = LogWriter.FILE_NAME % (self.__name, date.today().strftime(LogWriter.FORMAT_DAY))
+        for name in os.listdir(self.__log_dir):
+            if name.startswith(self.__name + "_") and name.endswith(".log") and name != current_name:
+                LogWriter.__try_compress(os.path.join(self.__log_dir, name))
+
+    def __get_path(self, day: str) -> str:
+        return os.path.join(self.__log_dir, LogWriter.FILE_NAME % (self.__name, day))
+
+    def __get_rotated_path(self, day: str) -> str:
+        number = 1
+        while True:
+            path = os.path.join(self.__log_dir, LogWriter.FILE_NAME_ROTATED % (self.__name, day, number))
+            if not os.path.exists(path) and not os.path.exists(path + ".gz"):
+                return path
+            number += 1
+
+    @staticmethod
+    def __try_compress(path: str):
+        # a file which can not be compressed, e.g. one still held by another instance, is left as it is
+        try:
+            LogWriter.__compress(path)
+        except OSError as ex:
+            print("Could not compress log %s: %s" % (path, ex), file=sys.stderr)
+
+    @staticmethod
+    def __compress(path: str):
+        if not os.path.exists(path):
+            return
+
+        with open(path, "rb") as source, gzip.open(path + ".gz", "wb") as target:
+            shutil.copyfileobj(source, target)
+        os.remove(path)
@@ -3,11 +3,12 @@
 Main window.
 """
 
-from PyQt5.QtGui import QIcon
-from PyQt5.QtWidgets import QMainWindow, QTabWidget
-from src.Tools import Config
+from PyQt5.QtCore import QTimer, pyqtSignal
+from PyQt5.QtGui import QIcon, QCloseEvent, QKeySequence, QPaintEvent
+from PyQt5.QtWidgets import QMainWindow, QTabWidget, QShortcut, QWidget, QVBoxLayout
+from src.Tools import Tools, Config
 from src.DbModel import DbModel
-from src.EventTab import EventTab
+from src.EventInfoCache import EventInfoCache
 from src.ReminderEventTab import ReminderEventTab
 from src.Resources import Resources
 
@@ -15,6 +16,12 @@ from src.Resources import Resources
 class MainWindow(QMainWindow):
     """
     Application main window.
+    Tabs are built when they are activated for the first time, so a tab which is never opened costs nothing.
+    """
+
+    first_paint_signal = pyqtSignal()
+    """
+    Emitted once, when the window has been painted for the first time.
     """
 
     def __init__(self):
@@ -22,18 +29,87 @@ class MainWindow(QMainWindow):
         self.setWindowIcon(QIcon(Config.ICON_PATH))
 
         self.__db = DbModel(Config.DB_NAME)
+        self.__event_info_cache = EventInfoCache()
+        self.__reminder_event_tab = None
+        self.__event_tab = None
+        self.__tab_factories = {}
+        self.__is_painted = False
         self.__tabs = QTabWidget()
+        self.__tabs.currentChanged.connect(self.__tab_changed)
         self.__add_tabs()
+        self.__service_window = None
+        self.__diagnostics_shortcut = QShortcut(QKeySequence(Resources.MainWindow_Shortcut_Diagnostics), self)
+        self.__diagnostics_shortcut.activated.connect(self.show_diagnostics)
 
         super(MainWindow, self).setCentralWidget(self.__tabs)
         super(MainWindow, self).setFixedSize(Config.WINDOW_WIDTH, Config.WINDOW_HEIGHT)
         super(MainWindow, self).setWindowTitle(Config.WINDOW_TITLE)
 
+    def show_diagnostics(self):
+        """
+        Shows the diagnostics window. The window is created on the first call.
+        """
+        if self.__service_window is None:
+            from src.ServiceWindow import ServiceWindow
+            self.__service_window = ServiceWindow(self.__db, self.__event_info_cache)
+        self.__service_window.show()
+        self.__service_window.raise_()
+
+    def paintEvent(self, event: QPaintEvent):
+        """
+        Emits first_paint_signal after the first paint, once the events queued meanwhile are processed.
+        :param event: Paint event.
+        """
+        super(MainWindow, self).paintEvent(event)
+        if not self.__is_painted:
+            self.__is_painted = True
+            QTimer.singleShot(0, self.first_paint_signal.emit)
+
+    def write_query_statistics(self):
+        """
+        Writes statistics of all queries executed so far to the query log.
+        """
+        Tools.write_query_log(self.__db.statistics.dump())
+
+    def closeEvent(self, event: QCloseEvent):
+        """
+        Closes the diagnostics window when the window is closed.
+        :param event: Close event.
+        """
+        if self.__service_window is not None:
+            self.__service_window.close()
+        super(MainWindow, self).closeEvent(event)
+
     def __add_tabs(self):
-        self.__reminder_event_tab = ReminderEventTab(self.__db)
-        self.__event_tab = EventTab(self.__db)
+        self.__add_tab(self.__create_reminder_event_tab, Resources.TAB_NAME_Reminder)
+        self.__add_tab(self.__create_event_tab, Resources.TAB_NAME_Event)
+
+    def __add_tab(self, factory, name: str):
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.__tab_factories[id(container)] = factory
+        self.__tabs.addTab(container, name)
+
+    def __tab_changed(self, index: int):
+        container = self.__tabs.widget(index)
+        factory = self.__tab_factories.pop(id(container), None) if container is not None else None
+        if factory is None:  # the tab is already built
+            return
+
+        container.layout().addWidget(factory())
+        Tools.write_verbose_class_method_name(self, MainWindow.__tab_changed, "built_tab", index)
+
+    def __create_reminder_event_tab(self) -> QWidget:
+        self.__reminder_event_tab = ReminderEventTab(self.__db, self.__event_info_cache)
+        return self.__reminder_event_tab
 
-        self.__event_tab.save_clicked_signal.connect(self.__reminder_event_tab.reload_slot)
+    def __create_event_tab(self) -> QWidget:
+        from src.EventTab import EventTab  # the table model and editor delegates are loaded with the tab
+        self.__event_tab = EventTab(self.__db, self.__event_info_cache)
+        self.__event_tab.save_clicked_signal.connect(self.__event_saved)
+        return self.__event_tab
 
-        self.__tabs.addTab(self.__reminder_event_tab, Resources.TAB_NAME_Reminder)
-        self.__tabs.addTab(self.__event_tab, Resources.TAB_NAME_Event)
+    def __event_saved(self):
+        if self.__reminder_event_tab is not None:
+            self.__reminder_event_tab.reload_slot()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Profiler of the whole application run.
+"""
+
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from src.Diagnostics import Diagnostics
+from src.QueryStatistics import QueryStatistics
+from src.Resources import Resources
+from src.Tools import Tools, Config
+
+
+class Profiler:
+    """
+    Profiles the thread which starts it with cProfile and, at the same time, samples its stack from
+    a background thread. On stop writes:
+    - pstats file, readable by pstats or snakeviz,
+    - collapsed stacks file ("frame;frame;frame count" lines), readable by flamegraph.pl or speedscope,
+    - spans file with every recorded user operation and the queries executed inside it.
+    The files share the path given to the constructor, the pstats one keeps it, others get their own extension.
+    """
+
+    EXTENSION_STATS = ".pstats"
+    EXTENSION_COLLAPSED = ".collapsed"
+    EXTENSION_SPANS = ".spans.txt"
+
+    def __init__(self, path: str):
+        base, extension = os.path.splitext(path)
+        self.__base = base if extension == Profiler.EXTENSION_STATS else path
+        self.__profile = cProfile.Profile()
+        self.__stacks = Counter()
+        self.__stop_event = threading.Event()
+        self.__sampler = None
+        self.__thread_id = None
+        self.__start = 0.0
+
+    def start(self):
+        """
+        Starts profiling the current thread and recording user operations.
+        """
+        self.__thread_id = threading.get_ident()
+        self.__stop_event.clear()
+        self.__sampler = threading.Thread(target=self.__sample, name="Profiler", daemon=True)
+        self.__sampler.start()
+        Diagnostics.start_recording()
+        self.__start = time.perf_counter()
+        self.__profile.enable()
+        Tools.write_verbose_class_method_name(self, Profiler.start, "path", self.__base)
+
+    def stop(self):
+        """
+        Stops profiling and writes the files.
+        """
+        self.__profile.disable()
+        records = Diagnostics.stop_recording()
+        self.__stop_event.set()
+        self.__sampler.join()
+
+        self.__profile.dump_stats(self.__base + Profiler.EXTENSION_STATS)
+        with open(self.__base + Profiler.EXTENSION_COLLAPSED, "w", encoding="utf-8") as file:
+            for stack, count in self.__stacks.most_common():
+                file.write("%s %d\n" % (stack, count))
+        with open(self.__base + Profiler.EXTENSION_SPANS, "w", encoding="utf-8") as file:
+            for name, depth, start, duration, queries in records:
+                indent = "    " * depth
+                file.write(Resources.Profiler_Format_Span % (indent, start - self.__start, duration * 1000, name))
+                for template, query_duration in queries:
+                    file.write(Resources.Profiler_Format_Query % (
+                        indent, query_duration * 1000, QueryStatistics.get_short_template(template)))
+
+        Tools.write_log(Resources.Profiler_Written % self.__base)
+
+    def __sample(self):
+        while not self.__stop_event.wait(Config.PROFILE_SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(self.__thread_id)
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append("%s (%s:%d)" % (code.co_name, os.path.basename(code.co_filename), code.co_firstlineno))
+                frame = frame.f_back
+            self.__stacks[";".join(reversed(stack))] += 1
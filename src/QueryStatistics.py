@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Timing statistics of executed queries.
+"""
+
+import threading
+from collections import deque
+from src.Tools import Config
+
+
+class QueryTemplateStatistics:
+    """
+    Statistics of one query template. Percentiles are computed from the latest durations only.
+    """
+
+    __slots__ = ("template", "count", "total", "maximum", "rows_affected", "durations")
+
+    def __init__(self, template: str):
+        self.template = template
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.rows_affected = 0
+        self.durations = deque(maxlen=Config.QUERY_STATISTICS_SAMPLES)
+
+    def percentile(self, percent: int) -> float:
+        """
+        Returns duration below which given percent of the latest executions finished.
+        :param percent: Percent from 0 to 100.
+        :return: Duration in seconds.
+        """
+        if not self.durations:
+            return 0.0
+
+        durations = sorted(self.durations)
+        position = max(0, -(-len(durations) * percent // 100) - 1)  # nearest rank
+        return durations[position]
+
+
+class QueryStatistics:
+    """
+    Aggregates execution time and affected rows per query template.
+    """
+
+    def __init__(self):
+        self.__items = {}
+        self.__lock = threading.Lock()
+
+    def add(self, template: str, duration: float, rows_affected: int = -1):
+        """
+        Adds one execution of a query.
+        :param template: Query template or query string.
+        :param duration: Execution time in seconds.
+        :param rows_affected: Number of rows changed by the query, negative if unknown.
+        """
+        with self.__lock:
+            item = self.__items.get(template)
+            if item is None:
+                item = QueryTemplateStatistics(template)
+                self.__items[template] = item
+
+            item.count += 1
+            item.total += duration
+            item.maximum = max(item.maximum, duration)
+            if rows_affected > 0:
+                item.rows_affected += rows_affected
+            item.durations.append(duration)
+
+    def get_items(self) -> list:
+        """
+        Returns statistics of all templates, the most expensive first.
+        :return: List of dicts with template, count, total, p50, p95, max and rows_affected. Times are in seconds.
+        """
+        with self.__lock:
+            items = list(self.__items.values())
+            result = [{
+                "template": QueryStatistics.get_short_template(item.template),
+                "count": item.count,
+                "total": item.total,
+                "p50": item.percentile(50),
+                "p95": item.percentile(95),
+                "max": item.maximum,
+                "rows_affected": item.rows_affected
+            } for item in items]
+
+        result.sort(key=lambda item: item["total"], reverse=True)
+        return result
+
+    def clear(self):
+        """
+        Removes all statistics.
+        """
+        with self.__lock:
+            self.__items.clear()
+
+    def dump(self) -> str:
+        """
+        Returns statistics formatted as a table, the most expensive template first.
+        :return: Text of the table.
+        """
+        lines = ["%8s %10s %9s %9s %9s %8s  %s" % ("count", "total ms", "p50 ms", "p95 ms", "max ms", "rows", "query")]
+        for item in self.get_items():
+            lines.append("%8d %10.2f %9.3f %9.3f %9.3f %8d  %s" % (
+                item["count"], item["total"] * 1000, item["p50"] * 1000, item["p95"] * 1000, item["max"] * 1000,
+                item["rows_affected"], item["template"]))
+
+        return "\n".join(lines)
+
+    @staticmethod
+    def get_short_template(template: str) -> str:
+        """
+        Returns template on one line, so that it fits a log line.
+        :param template: Query template.
+        :return: Template with whitespace collapsed.
+        """
+        return " ".join(template.split())
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Engine to compute occurrence dates of cyclic events.
+"""
+
+import numpy
+
+
+class RecurrenceEngine:
+    """
+    Computes occurrence dates for many cyclic events at once.
+    Dates are numpy datetime64[D] arrays. The next occurrence is the previous one moved by a number of months
+    and then by a number of days, the same as QDate.addMonths().addDays() does.
+    """
+
+    JULIAN_DAY_UNIX_EPOCH = 2440588
+    """
+    Julian day number of 1970-01-01, the epoch of numpy datetime64.
+    """
+
+    @staticmethod
+    def from_julian_days(days) -> numpy.ndarray:
+        """
+        Converts Julian day numbers, the format dates are stored in, to dates.
+        :param days: Sequence of Julian day numbers.
+        :return: Array of dates.
+        """
+        return (numpy.asarray(days, dtype=numpy.int64) - RecurrenceEngine.JULIAN_DAY_UNIX_EPOCH).astype("datetime64[D]")
+
+    @staticmethod
+    def to_julian_days(dates: numpy.ndarray) -> numpy.ndarray:
+        """
+        Converts dates to Julian day numbers.
+        :param dates: Array of dates.
+        :return: Array of Julian day numbers.
+        """
+        return numpy.asarray(dates, dtype="datetime64[D]").astype(numpy.int64) + RecurrenceEngine.JULIAN_DAY_UNIX_EPOCH
+
+    @staticmethod
+    def advance(dates, days, months) -> numpy.ndarray:
+        """
+        Returns next occurrence for every given date.
+        If the day of month does not exist in the target month the last day of that month is used.
+        :param dates: Array of dates.
+        :param days: Number of days of every event's cycle.
+        :param months: Number of months of every event's cycle.
+        :return: Array of next occurrence dates.
+        """
+        dates = numpy.asarray(dates, dtype="datetime64[D]")
+        months = numpy.asarray(months, dtype=numpy.int64)
+        if not months.any():
+            return dates + numpy.asarray(days, dtype=numpy.int64)
+
+        month_starts = dates.astype("datetime64[M]")
+        day_of_month = (dates - month_starts.astype("datetime64[D]")).astype(numpy.int64)
+        target_months = month_starts + months
+        target_starts = target_months.astype("datetime64[D]")
+        month_lengths = ((target_months + 1).astype("datetime64[D]") - target_starts).astype(numpy.int64)
+
+        return target_starts + numpy.minimum(day_of_month, month_lengths - 1) + numpy.asarray(days, dtype=numpy.int64)
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Model of events to remind.
+"""
+
+from bisect import bisect_left
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+from src.Resources import Resources
+from src.Tools import Tools, Config
+
+
+class ReminderEventModel(QAbstractTableModel):
+    """
+    Table model of reminder events ordered by event name and reminder Id.
+    Rows are (Id, EventId, Date, Name) tuples which can be patched in place.
+    Rows are loaded page by page: the view asks for the next page when it is scrolled near the end.
+    """
+
+    def __init__(self, fetch_rows):
+        """
+        :param fetch_rows: Function which takes the last loaded row and returns the next page of rows.
+        """
+        super(ReminderEventModel, self).__init__(None)
+        self.__fetch_rows = fetch_rows
+        self.__rows = []
+        self.__keys = []
+        self.__keys_by_id = {}
+        self.__last_row = None
+        self.__can_fetch_more = False
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """
+        Returns number of rows.
+        :param parent: Parent index.
+        :return: Number of rows.
+        """
+        if parent.isValid():
+            return 0
+
+        return len(self.__rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """
+        Returns number of columns.
+        :param parent: Parent index.
+        :return: Number of columns.
+        """
+        if parent.isValid():
+            return 0
+
+        return len(Resources.ReminderEventTab_Columns_Names)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> QVariant:
+        """
+        Returns data of a cell.
+        :param index: Model's index.
+        :param role: Data role.
+        :return: Data.
+        """
+        if role != Qt.DisplayRole or index.column() >= len(Resources.ReminderEventModel_Columns):
+            return QVariant()
+
+        value = self.__rows[index.row()][index.column()]
+        if index.column() == Resources.ReminderEventModel_Column_Date:
+            return Tools.get_display_date(value)
+
+        return "" if value is None else str(value)
+
+    def headerData(self, section: int, orientation: int, role: int = Qt.DisplayRole) -> QVariant:
+        """
+        Returns header title.
+        :param section: Column or row number.
+        :param orientation: Header orientation.
+        :param role: Data role.
+        :return: Header title.
+        """
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return Resources.ReminderEventTab_Columns_Names.get(section)
+
+        return super(ReminderEventModel, self).headerData(section, orientation, role)
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        """
+        Returns whether there are rows which are not loaded yet.
+        :param parent: Parent index.
+        :return: True if the next page can be loaded.
+        """
+        if parent.isValid():
+            return False
+
+        return self.__can_fetch_more
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()):
+        """
+        Loads the next page of rows.
+        :param parent: Parent index.
+        """
+        if parent.isValid() or not self.__can_fetch_more:
+            return
+
+        rows = self.__fetch_rows(self.__last_row)
+        self.__set_last_row(rows)
+        if rows:
+            first = len(self.__rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self.__rows.extend(rows)
+            for row in rows:
+                key = ReminderEventModel.__get_key(row)
+                self.__keys.append(key)
+                self.__keys_by_id[row[0]] = key
+            self.endInsertRows()
+        Tools.write_verbose_class_method_name(self, ReminderEventModel.fetchMore, "rows", len(rows))
+
+    def record(self, row: int) -> tuple:
+        """
+        Returns row's values.
+        :param row: Row number.
+        :return: Tuple (Id, EventId, Date, Name).
+        """
+        return self.__rows[row]
+
+    def set_rows(self, rows: list):
+        """
+        Replaces all rows with the first page.
+        :param rows: List of (Id, EventId, Date, Name) tuples ordered by name and Id.
+        """
+        self.beginResetModel()
+        self.__rows = list(rows)
+        self.__keys = [ReminderEventModel.__get_key(row) for row in self.__rows]
+        self.__keys_by_id = {key[-1]: key for key in self.__keys}
+        self.__last_row = None
+        self.__set_last_row(self.__rows)
+        self.endResetModel()
+        Tools.write_verbose_class_method_name(self, ReminderEventModel.set_rows, "rows", len(self.__rows))
+
+    def upsert_rows(self, rows: list):
+        """
+        Inserts given rows at their ordered positions. Rows with already present Id are replaced.
+        Rows after the last loaded one are skipped, they come with the next pages.
+        :param rows: List of (Id, EventId, Date, Name) tuples.
+        """
+        last_key = None if self.__last_row is None else ReminderEventModel.__get_key(self.__last_row)
+        for row in rows:
+            self.remove_id(row[0])
+            key = ReminderEventModel.__get_key(row)
+            if self.__can_fetch_more and key > last_key:
+                continue
+
+            position = bisect_left(self.__keys, key)
+            self.beginInsertRows(QModelIndex(), position, position)
+            self.__rows.insert(position, row)
+            self.__keys.insert(position, key)
+            self.__keys_by_id[row[0]] = key
+            self.endInsertRows()
+
+    def remove_id(self, index: int):
+        """
+        Removes row with given reminder Id if present.
+        :param index: Reminder event Id.
+        """
+        row = self.find_row(index)
+        if row >= 0:
+            self.remove_row(row)
+
+    def remove_row(self, row: int):
+        """
+        Removes row.
+        :param row: Row number.
+        """
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.__keys_by_id[self.__rows[row][0]]
+        del self.__rows[row]
+        del self.__keys[row]
+        self.endRemoveRows()
+
+    def find_row(self, index: int) -> int:
+        """
+        Returns row number for given reminder Id. The row is found by its sort key in O(log n).
+        :param index: Reminder event Id.
+        :return: Row number or -1 if not found.
+        """
+        key = self.__keys_by_id.get(index)
+        if key is None:
+            return -1
+
+        return bisect_left(self.__keys, key)
+
+    def __set_last_row(self, rows: list):
+        self.__can_fetch_more = len(rows) >= Config.REMINDER_PAGE_SIZE
+        if rows:
+            self.__last_row = rows[-1]
+
+    @staticmethod
+    def __get_key(row: tuple) -> tuple:
+        # the same order as SQLite's: NULL names first, then names compared by code points
+        name = row[Resources.ReminderEventModel_Column_Name]
+        return name is not None, "" if name is None else name, row[0]
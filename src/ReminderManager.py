@@ -3,10 +3,11 @@
 Manager to operate on reminder data.
 """
 
-from PyQt5.QtCore import QDateTime, QDate
-from PyQt5.QtSql import QSqlQueryModel
-from src.Tools import Tools
+from src.Tools import Tools, Config
 from src.DbModel import DbModel
+from src.EventInfoCache import EventInfo, EventInfoCache
+from src.ReminderEventModel import ReminderEventModel
+from src.ReminderScheduler import ReminderScheduler
 from src.Resources import Resources
 
 
@@ -15,9 +16,15 @@ class ReminderManager:
     Manager to manage remind logic.
     """
 
-    def __init__(self, db: DbModel):
+    def __init__(self, db: DbModel, event_info_cache: EventInfoCache):
         self.__db = db
-        self.__model = QSqlQueryModel()
+        self.__event_info_cache = event_info_cache
+        self.__model = ReminderEventModel(self.__fetch_rows)
+        self.__change_version = 0
+        self.__refresh_day = 0
+        self.__search = None
+        self.__scheduler = ReminderScheduler()
+        self.__scheduler.due_signal.connect(self.refresh_due)
         self.refresh_data()
 
     def set_done(self, reminder_id: int, event_id: int):
@@ -26,91 +33,256 @@ class ReminderManager:
         :param reminder_id: Reminder event Id.
         :param event_id: Event Id.
         """
-        self.__db.exec(Resources.ReminderManager_UPDATE_ReminderEventIsDone % str(reminder_id))
-        self.__add_events_to_reminder(reminder_id, event_id)
-        Tools.write_verbose_class_method_name(self, ReminderManager.set_done, "reminder_id", str(reminder_id))
+        self.set_done_many([(reminder_id, event_id)])
+        Tools.write_verbose_class_method_name(self, ReminderManager.set_done, "reminder_id", reminder_id)
+
+    def set_done_many(self, pairs: list):
+        """
+        Sets flag IsDone on 1 for all given reminders and adds next events to the reminder in one transaction.
+        The result is the same as calling set_done for every pair in the given order.
+        :param pairs: List of (reminder event Id, event Id) tuples.
+        """
+        if not pairs:
+            return
+
+        event_ids = {event_id for reminder_id, event_id in pairs}
+        try:
+            with self.__db.transaction():
+                self.__db.set_id_list(reminder_id for reminder_id, event_id in pairs)
+                reminder_events = self.__get_reminder_events()
+                event_infos = self.__get_event_infos(event_ids)
+                self.__db.exec_prepared(Resources.ReminderManager_UPDATE_ReminderEventIsDone)
+                rows = self.__get_reminder_events_to_add(pairs, reminder_events, event_infos)
+                self.__db.exec_many(Resources.Manager_INSERT_ReminderEvent, rows)
+        except Exception:
+            # pending counts of cached infos were already changed in place
+            for event_id in event_ids:
+                self.__event_info_cache.invalidate(event_id)
+            raise
+
+        Tools.write_verbose_class_method_name(self, ReminderManager.set_done_many, "pairs", len(pairs))
+
+    def set_search(self, text: str):
+        """
+        Limits model to reminders of events which names match given text and repopulates it.
+        :param text: Searched text. Empty text shows all reminders.
+        """
+        self.__search = Tools.get_search_match(text)
+        self.refresh_data()
+        Tools.write_verbose_class_method_name(self, ReminderManager.set_search, "search", self.__search)
 
     def refresh_data(self):
         """
         Repopulate model.
         """
-        today_date = QDateTime().currentDateTime().toString(Resources.FORMAT_DATE_STORE)
-        query = Resources.ReminderManager_SELECT_ReminderEventList % today_date
-        self.model.setQuery(query)
-        Tools.write_verbose_class_name(self, "Data refreshed for date %s" % today_date)
-        Tools.write_verbose_class_method_name(self, ReminderManager.refresh_data, "query", query)
-
-    def __add_events_to_reminder(self, index: int, event_id: int):
-        event_info = self.__get_event_info(event_id)
-        count_to_add = self.__get_event_count_to_add(event_info)
-        Tools.write_verbose_class_method_name(self, ReminderManager.__add_events_to_reminder, "count_to_add", str(count_to_add))
-
-        if count_to_add == 0:
+        today_date = Tools.get_current_day()
+        with self.__db.transaction():
+            change_version = self.__get_change_version()
+            rows = self.__get_rows(Resources.ReminderManager_SELECT_ReminderEventList, self.__search, self.__search,
+                                   today_date, Config.REMINDER_PAGE_SIZE)
+            upcoming_dates = self.__get_dates(Resources.ReminderManager_SELECT_UpcomingDates, today_date)
+
+        self.__refresh_day = today_date
+        self.model.set_rows(rows)
+        self.__set_change_version(change_version)
+        self.__scheduler.clear()
+        self.__scheduler.schedule(upcoming_dates)
+        Tools.write_verbose_class_name(self, "Data refreshed for date %s", today_date)
+
+    def refresh_changes(self):
+        """
+        Patches model with reminders inserted, updated or deleted since the last refresh.
+        Changes are read from ReminderEventChange table filled by triggers.
+        """
+        today_date = Tools.get_current_day()
+        with self.__db.transaction():
+            change_version = self.__get_change_version()
+            changed_ids = self.__get_changed_ids()
+            rows = self.__get_rows(Resources.ReminderManager_SELECT_ReminderEventChangedList, self.__search, self.__search,
+                                   today_date, self.__change_version)
+            upcoming_dates = self.__get_dates(Resources.ReminderManager_SELECT_ChangedUpcomingDates, today_date, self.__change_version)
+
+        for index in changed_ids.difference(row[0] for row in rows):
+            self.model.remove_id(index)
+        self.model.upsert_rows(rows)
+        self.__set_change_version(change_version)
+        self.__scheduler.schedule(upcoming_dates)
+        Tools.write_verbose_class_method_name(self, ReminderManager.refresh_changes, "changed_ids", len(changed_ids))
+
+    def refresh_due(self, today_date: int):
+        """
+        Adds to model reminders which became due since the last refresh.
+        :param today_date: Current Julian day number.
+        """
+        if today_date <= self.__refresh_day:
             return
 
-        start_date = self.__get_new_reminder_event_date(index, event_info)
-        start_date = start_date.toString(Resources.FORMAT_DATE_STORE)
+        rows = self.__get_rows(Resources.ReminderManager_SELECT_ReminderEventDueList, self.__search, self.__search,
+                               self.__refresh_day, today_date)
+        self.model.upsert_rows(rows)
+        self.__refresh_day = today_date
+        Tools.write_verbose_class_method_name(self, ReminderManager.refresh_due, "rows", len(rows))
+
+    def __fetch_rows(self, last_row: tuple) -> list:
+        # keyset pagination on (Name, Id), so every page is read by index no matter how deep it is
+        name = last_row[Resources.ReminderEventModel_Column_Name]
+        if name is None:
+            return self.__get_rows(Resources.ReminderManager_SELECT_ReminderEventListAfterNullName, self.__search, self.__search,
+                                   self.__refresh_day, last_row[0], Config.REMINDER_PAGE_SIZE)
+
+        return self.__get_rows(Resources.ReminderManager_SELECT_ReminderEventListAfterName, self.__search, self.__search,
+                               self.__refresh_day, name, name, last_row[0], Config.REMINDER_PAGE_SIZE)
+
+    def __get_reminder_events_to_add(self, pairs: list, reminder_events: dict, event_infos: dict) -> list:
+        new_dates = self.__get_new_reminder_event_dates(pairs, reminder_events, event_infos)
+        rows = []
+        for position, (reminder_id, event_id) in enumerate(pairs):
+            reminder_event = reminder_events.get(reminder_id)
+            event_info = event_infos.get(event_id)
+            if reminder_event is None or event_info is None:
+                continue
 
-        for i in range(count_to_add):
-            sql = Resources.Manager_INSERT_ReminderEvent % (event_id, start_date)
-            self.__db.exec(sql)
+            if not reminder_event["IsDone"]:
+                reminder_event["IsDone"] = 1
+                event_info.reminder_count -= 1
 
-    def __get_new_reminder_event_date(self, index: int, event_info: dict) -> QDate:
-        day_count = int(event_info["Day"])
-        month_count = int(event_info["Month"])
-        reminder_date = self.__get_reminder_event_date(index)
-        new_date = reminder_date.addMonths(month_count)
-        new_date = new_date.addDays(day_count)
+            if new_dates[position] is None:  # the reminder has no valid date to continue the series from
+                continue
 
-        return new_date
+            count_to_add = self.__get_event_count_to_add(event_info)
+            Tools.write_verbose_class_method_name(self, ReminderManager.__get_reminder_events_to_add, "count_to_add", count_to_add)
+            event_info.reminder_count += count_to_add
+            rows.extend([(event_id, new_dates[position])] * count_to_add)
 
-    def __get_event_count_to_add(self, event_info: dict) -> int:
+        return rows
+
+    def __get_new_reminder_event_dates(self, pairs: list, reminder_events: dict, event_infos: dict) -> list:
+        dates = []
+        days = []
+        months = []
+        for reminder_id, event_id in pairs:
+            reminder_event = reminder_events.get(reminder_id)
+            event_info = event_infos.get(event_id)
+            if reminder_event is None or event_info is None or not Tools.is_valid_day(reminder_event["Date"]):
+                dates.append(0)  # nothing will be added for this pair
+                days.append(0)
+                months.append(0)
+                continue
+
+            dates.append(reminder_event["Date"])
+            days.append(event_info.day or 0)
+            months.append(event_info.month or 0)
+
+        from src.RecurrenceEngine import RecurrenceEngine  # loads numpy, which is needed only once a reminder is done
+        new_dates = RecurrenceEngine.advance(RecurrenceEngine.from_julian_days(dates), days, months)
+        new_dates = RecurrenceEngine.to_julian_days(new_dates).tolist()
+        return [new_date if Tools.is_valid_day(date) else None for date, new_date in zip(dates, new_dates)]
+
+    def __get_event_count_to_add(self, event_info: EventInfo) -> int:
         zero = 0
-        if not bool(event_info["IsActive"]):
+        if not event_info.is_active:
             return zero
-        if not bool(event_info["IsCyclic"]):
+        if not event_info.is_cyclic:
             return zero
-        start_date = Tools.get_date_from_string(str(event_info["StartDate"]))
-        current_date = Tools.get_current_date()
-        if start_date > current_date:
+        if event_info.start_date > Tools.get_current_day():
             return zero
-        count_to_add = int(event_info["Count"]) - int(event_info["ReminderCount"])
+        count_to_add = event_info.count - event_info.reminder_count
         if count_to_add <= 0:
             return zero
 
-        Tools.write_verbose_class_method_name(self, ReminderManager.__get_event_count_to_add, "count_to_add", str(count_to_add))
+        Tools.write_verbose_class_method_name(self, ReminderManager.__get_event_count_to_add, "count_to_add", count_to_add)
         return count_to_add
 
-    def __get_event_info(self, event_id: int) -> dict:
-        event_id_str = str(event_id)
-        query = self.__db.exec(Resources.ReminderManager_SELECT_EventInfo % (event_id_str, event_id_str))
-        query.next()
-        result = {
-            "StartDate": query.value(0),
-            "IsCyclic": query.value(1),
-            "Count": query.value(2),
-            "Day": query.value(3),
-            "Month": query.value(4),
-            "IsActive": query.value(5),
-            "ReminderCount": query.value(6)
-        }
+    def __get_rows(self, template: str, *values) -> list:
+        query = self.__db.exec_prepared(template, *values)
+        result = []
+        while query.next():
+            # NULL name is kept as None, it is ordered apart from empty name
+            name = None if query.isNull(3) else query.value(3)
+            result.append((query.value(0), query.value(1), query.value(2), name))
+        query.finish()
+
+        return result
+
+    def __get_dates(self, template: str, *values) -> list:
+        query = self.__db.exec_prepared(template, *values)
+        result = []
+        while query.next():
+            result.append(query.value(0))
+        query.finish()
+
+        return result
+
+    def __get_changed_ids(self) -> set:
+        query = self.__db.exec_prepared(Resources.ReminderManager_SELECT_ChangedReminderEventIds, self.__change_version)
+        result = set()
+        while query.next():
+            result.add(query.value(0))
+        query.finish()
 
         return result
 
-    def __get_reminder_event_date(self, index: int) -> QDate:
-        query = self.__db.exec(Resources.ReminderManager_SELECT_ReminderEventDate % str(index))
+    def __get_change_version(self) -> int:
+        query = self.__db.exec_prepared(Resources.ReminderManager_SELECT_ChangeVersion)
         query.next()
-        date = query.value(0)
-        if not date:
-            date = ''
+        version = query.value(0)
+        query.finish()
+        if not version:
+            version = 0
+
+        return int(version)
+
+    def __set_change_version(self, version: int):
+        # changes are consumed by this manager only, so the ones already applied can be dropped
+        self.__change_version = version
+        self.__db.exec_prepared(Resources.ReminderManager_DELETE_ReminderEventChange, version)
+
+    def __get_reminder_events(self) -> dict:
+        query = self.__db.exec_prepared(Resources.ReminderManager_SELECT_ReminderEventIdList)
+        result = {}
+        while query.next():
+            result[query.value(0)] = {
+                "EventId": query.value(1),
+                "Date": None if query.isNull(2) else query.value(2),
+                "IsDone": query.value(3)
+            }
+        query.finish()
+
+        return result
+
+    def __get_event_infos(self, event_ids: set) -> dict:
+        result = {}
+        for event_id in event_ids:
+            event_info = self.__event_info_cache.get(event_id)
+            if event_info is not None:
+                result[event_id] = event_info
+
+        if len(result) == len(event_ids):
+            return result
+
+        # events of all reminders in IdList are read, which refreshes cached ones too
+        query = self.__db.exec_prepared(Resources.ReminderManager_SELECT_EventInfoIdList)
+        while query.next():
+            # NULL start date, e.g. an unparsable one migrated from text, counts as a date which is not in the future
+            event_info = EventInfo(ReminderManager.__get_int(query, 1), bool(query.value(2)), ReminderManager.__get_int(query, 3),
+                                   ReminderManager.__get_int(query, 4), ReminderManager.__get_int(query, 5),
+                                   bool(query.value(6)), ReminderManager.__get_int(query, 7))
+            result[query.value(0)] = event_info
+            self.__event_info_cache.put(query.value(0), event_info)
+        query.finish()
+
+        return result
 
-        return Tools.get_date_from_string(date)
+    @staticmethod
+    def __get_int(query, column: int) -> int:
+        # PyQt returns NULL as an empty string, which int() does not accept
+        return 0 if query.isNull(column) else int(query.value(column))
 
     @property
-    def model(self):
+    def model(self) -> ReminderEventModel:
         """
-        Returns query model.
-        :return: Query model.
+        Returns reminder event model.
+        :return: Reminder event model.
         """
         return self.__model
 
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Scheduler of reminders becoming due.
+"""
+
+import heapq
+from PyQt5.QtCore import Qt, QObject, QTimer, QDateTime, QTime, pyqtSignal
+from src.Tools import Tools, Config
+
+
+class ReminderScheduler(QObject):
+    """
+    Keeps a min-heap of upcoming reminder dates and arms a single timer for the day the earliest one becomes due.
+    Does not wake up while nothing is going to become due.
+    A long wait is split into steps of at most Config.SCHEDULER_MAX_INTERVAL. Timers do not run while the machine
+    is suspended, so every step checks the wall clock again.
+    """
+
+    due_signal = pyqtSignal(int)
+    """
+    Emitted with current Julian day number when scheduled dates became due.
+    """
+
+    DUE_DELAY = 1000
+    """
+    Delay after midnight, in milliseconds, so that the timer never fires before the day changes.
+    """
+
+    def __init__(self):
+        super(ReminderScheduler, self).__init__(None)
+        self.__dates = []
+        self.__scheduled = set()
+        self.__timer = QTimer(self)
+        self.__timer.setSingleShot(True)
+        self.__timer.setTimerType(Qt.VeryCoarseTimer)
+        self.__timer.timeout.connect(self.__timeout)
+
+    def schedule(self, dates):
+        """
+        Adds dates to wait for. Dates which are not in the future or are already scheduled are skipped.
+        :param dates: Iterable of Julian day numbers.
+        """
+        today = Tools.get_current_day()
+        for date in dates:
+            if date > today and date not in self.__scheduled:
+                heapq.heappush(self.__dates, date)
+                self.__scheduled.add(date)
+
+        self.__arm()
+
+    def clear(self):
+        """
+        Removes all scheduled dates and stops the timer.
+        """
+        self.__dates = []
+        self.__scheduled.clear()
+        self.__timer.stop()
+
+    def __arm(self):
+        if not self.__dates:
+            self.__timer.stop()
+            return
+
+        due_time = QDateTime(Tools.get_date_from_day(self.__dates[0]), QTime(0, 0))
+        interval = QDateTime.currentDateTime().msecsTo(due_time) + ReminderScheduler.DUE_DELAY
+        self.__timer.start(max(0, min(interval, Config.SCHEDULER_MAX_INTERVAL)))
+        Tools.write_verbose_class_method_name(self, ReminderScheduler.__arm, "interval", interval)
+
+    def __timeout(self):
+        today = Tools.get_current_day()
+        is_due = False
+        while self.__dates and self.__dates[0] <= today:
+            self.__scheduled.discard(heapq.heappop(self.__dates))
+            is_due = True
+
+        self.__arm()
+        if is_due:
+            Tools.write_verbose_class_method_name(self, ReminderScheduler.__timeout, "today", today)
+            self.due_signal.emit(today)
@@ -3,8 +3,6 @@
 Hardcoded resources.
 """
 
-from PyQt5.QtCore import QDate
-
 
 class Resources:
     """
@@ -12,7 +10,8 @@ class Resources:
     """
 
     FORMAT_DATE_DISPLAY = "dd-MM-yyyy"
-    FORMAT_DATE_STORE = "yyyyMMdd"
+    LOG_NAME_Main = "log"
+    LOG_NAME_Query = "query"
     TABLE_NAME_Reminder = "ReminderEvent"
     TABLE_NAME_Event = "Event"
     TAB_NAME_Reminder = "Reminders"
@@ -40,6 +39,169 @@ class Resources:
             IsDone INTEGER
         )
         """
+    CREATE_TEMP_TABLE_IdList = """
+        CREATE TEMP TABLE IF NOT EXISTS IdList
+        (
+            Id INTEGER PRIMARY KEY,
+            Value INTEGER
+        )
+        """
+    CREATE_TABLE_SchemaVersion = """
+        CREATE TABLE IF NOT EXISTS SchemaVersion
+        (
+            Version INTEGER PRIMARY KEY
+        )
+        """
+
+    DbModel_PRAGMA = """
+        PRAGMA %s=%s
+        """
+    DbModel_DELETE_IdList = """
+        DELETE FROM temp.IdList
+        """
+    DbModel_INSERT_IdList = """
+        INSERT OR IGNORE INTO temp.IdList (Id) VALUES %s
+        """
+    DbModel_INSERT_IdList_Row = "(?)"
+    DbModel_INSERT_IdValueList = """
+        INSERT OR REPLACE INTO temp.IdList (Id, Value) VALUES %s
+        """
+    DbModel_INSERT_IdValueList_Row = "(?, ?)"
+    DbModel_SELECT_SchemaVersion = """
+        SELECT MAX(Version) FROM SchemaVersion
+        """
+    DbModel_INSERT_SchemaVersion = """
+        INSERT INTO SchemaVersion (Version) VALUES (?)
+        """
+    DbModel_EXPLAIN_QUERY_PLAN = """
+        EXPLAIN QUERY PLAN %s
+        """
+    DbModel_Slow_Query = "Slow query (%.1f ms): %s (values = %.200s) (plan = %s)"
+    # Converts yyyyMMdd string of a column to Julian day number, the same as QDate.toJulianDay() returns.
+    # Empty and malformed strings give NULL.
+    DbModel_Julian_Day_From_Date_String = """
+        CAST(julianday(substr(%s, 1, 4) || '-' || substr(%s, 5, 2) || '-' || substr(%s, 7, 2)) + 0.5 AS INTEGER)
+        """
+    # Ordered schema changes applied on top of CREATE_TABLE_* statements.
+    # Migration at position N upgrades the database to version N + 1.
+    DbModel_Migrations = [
+        [
+            "CREATE INDEX IF NOT EXISTS ReminderEvent_EventId_IsDone ON ReminderEvent (EventId, IsDone)",
+            "CREATE INDEX IF NOT EXISTS ReminderEvent_IsDone_Date ON ReminderEvent (IsDone, Date)"
+        ],
+        [
+            """
+            CREATE TABLE EventMigration
+            (
+                Id INTEGER PRIMARY KEY,
+                Name VARCHAR,
+                StartDate INTEGER,
+                IsCyclic INTEGER,
+                Count INTEGER,
+                Day INTEGER,
+                Month INTEGER,
+                IsActive INTEGER
+            )
+            """,
+            """
+            INSERT INTO EventMigration (Id, Name, StartDate, IsCyclic, Count, Day, Month, IsActive)
+            SELECT Id, Name, """ + DbModel_Julian_Day_From_Date_String % ("StartDate", "StartDate", "StartDate") + """, IsCyclic, Count, Day, Month, IsActive
+            FROM Event
+            """,
+            "DROP TABLE Event",
+            "ALTER TABLE EventMigration RENAME TO Event",
+            """
+            CREATE TABLE ReminderEventMigration
+            (
+                Id INTEGER PRIMARY KEY,
+                EventId INTEGER,
+                Date INTEGER,
+                IsDone INTEGER
+            )
+            """,
+            """
+            INSERT INTO ReminderEventMigration (Id, EventId, Date, IsDone)
+            SELECT Id, EventId, """ + DbModel_Julian_Day_From_Date_String % ("Date", "Date", "Date") + """, IsDone
+            FROM ReminderEvent
+            """,
+            "DROP TABLE ReminderEvent",
+            "ALTER TABLE ReminderEventMigration RENAME TO ReminderEvent",
+            "CREATE INDEX ReminderEvent_EventId_IsDone ON ReminderEvent (EventId, IsDone)",
+            "CREATE INDEX ReminderEvent_IsDone_Date ON ReminderEvent (IsDone, Date)"
+        ],
+        [
+            """
+            CREATE TABLE ReminderEventChange
+            (
+                Version INTEGER PRIMARY KEY AUTOINCREMENT,
+                ReminderEventId INTEGER
+            )
+            """,
+            """
+            CREATE TRIGGER ReminderEvent_Insert_Change AFTER INSERT ON ReminderEvent
+            BEGIN
+                INSERT INTO ReminderEventChange (ReminderEventId) VALUES (NEW.Id);
+            END
+            """,
+            """
+            CREATE TRIGGER ReminderEvent_Update_Change AFTER UPDATE ON ReminderEvent
+            BEGIN
+                INSERT INTO ReminderEventChange (ReminderEventId) VALUES (NEW.Id);
+            END
+            """,
+            """
+            CREATE TRIGGER ReminderEvent_Delete_Change AFTER DELETE ON ReminderEvent
+            BEGIN
+                INSERT INTO ReminderEventChange (ReminderEventId) VALUES (OLD.Id);
+            END
+            """,
+            """
+            CREATE TRIGGER Event_Update_Change AFTER UPDATE OF Name, IsActive ON Event
+            WHEN OLD.Name IS NOT NEW.Name OR OLD.IsActive IS NOT NEW.IsActive
+            BEGIN
+                INSERT INTO ReminderEventChange (ReminderEventId) SELECT Id FROM ReminderEvent WHERE EventId=NEW.Id AND IsDone=0;
+            END
+            """
+        ],
+        [
+            "CREATE INDEX IF NOT EXISTS Event_Name ON Event (Name)"
+        ],
+        [
+            "CREATE VIRTUAL TABLE EventSearch USING fts5 (Name, content='Event', content_rowid='Id', prefix='2 3')",
+            "INSERT INTO EventSearch (EventSearch) VALUES ('rebuild')",
+            """
+            CREATE TRIGGER Event_Insert_Search AFTER INSERT ON Event
+            BEGIN
+                INSERT INTO EventSearch (rowid, Name) VALUES (NEW.Id, NEW.Name);
+            END
+            """,
+            """
+            CREATE TRIGGER Event_Update_Search AFTER UPDATE OF Id, Name ON Event
+            BEGIN
+                INSERT INTO EventSearch (EventSearch, rowid, Name) VALUES ('delete', OLD.Id, OLD.Name);
+                INSERT INTO EventSearch (rowid, Name) VALUES (NEW.Id, NEW.Name);
+            END
+            """,
+            """
+            CREATE TRIGGER Event_Delete_Search AFTER DELETE ON Event
+            BEGIN
+                INSERT INTO EventSearch (EventSearch, rowid, Name) VALUES ('delete', OLD.Id, OLD.Name);
+            END
+            """
+        ]
+    ]
+
+    # Queries run before the migration of the given version. They count values the migration cannot keep,
+    # the count is written to the log.
+    DbModel_Migrations_Checks = {
+        2: (
+            "SELECT (SELECT COUNT(*) FROM Event WHERE StartDate<>'' AND "
+            + DbModel_Julian_Day_From_Date_String % ("StartDate", "StartDate", "StartDate") + " IS NULL) + "
+            "(SELECT COUNT(*) FROM ReminderEvent WHERE Date<>'' AND "
+            + DbModel_Julian_Day_From_Date_String % ("Date", "Date", "Date") + " IS NULL)",
+            "%s dates are not in yyyyMMdd format and are left empty."
+        )
+    }
 
     ReminderEventTab_Columns_Visible = {
         0: False,
@@ -63,11 +225,77 @@ class Resources:
         4: ""
     }
     ReminderEventTab_Column_EventId = 1
+    ReminderEventTab_Column_Done = 4
     ReminderEventTab_BUTTON_NAME_Done = "Done"
-    ReminderEventTab_Property_Id = "propId"
-    ReminderEventTab_Property_EventId = "propEventId"
+    ReminderEventTab_BUTTON_NAME_Done_Selected = "Done selected"
+    ReminderEventTab_Search_Placeholder = "Search"
 
+    ReminderEventModel_Columns = ["Id", "EventId", "Date", "Name"]
+    ReminderEventModel_Column_Date = 2
+    ReminderEventModel_Column_Name = 3
+
+    # pages walk events by Event_Name index, reminders of each event are read by ReminderEvent_EventId_IsDone
     ReminderManager_SELECT_ReminderEventList = """
+        SELECT
+            R.Id,
+            R.EventId,
+            R.Date,
+            E.Name
+        FROM
+            Event AS E
+            CROSS JOIN ReminderEvent AS R ON R.EventId=E.Id
+        WHERE
+            E.IsActive=1
+            AND (? IS NULL OR E.Id IN (SELECT rowid FROM EventSearch WHERE EventSearch MATCH ?))
+            AND R.IsDone=0
+            AND +R.Date<=?
+        ORDER BY
+            E.Name,
+            R.Id
+        LIMIT ?
+        """
+    ReminderManager_SELECT_ReminderEventListAfterName = """
+        SELECT
+            R.Id,
+            R.EventId,
+            R.Date,
+            E.Name
+        FROM
+            Event AS E
+            CROSS JOIN ReminderEvent AS R ON R.EventId=E.Id
+        WHERE
+            E.IsActive=1
+            AND (? IS NULL OR E.Id IN (SELECT rowid FROM EventSearch WHERE EventSearch MATCH ?))
+            AND R.IsDone=0
+            AND +R.Date<=?
+            AND E.Name>=?
+            AND (E.Name>? OR R.Id>?)
+        ORDER BY
+            E.Name,
+            R.Id
+        LIMIT ?
+        """
+    ReminderManager_SELECT_ReminderEventListAfterNullName = """
+        SELECT
+            R.Id,
+            R.EventId,
+            R.Date,
+            E.Name
+        FROM
+            Event AS E
+            CROSS JOIN ReminderEvent AS R ON R.EventId=E.Id
+        WHERE
+            E.IsActive=1
+            AND (? IS NULL OR E.Id IN (SELECT rowid FROM EventSearch WHERE EventSearch MATCH ?))
+            AND R.IsDone=0
+            AND +R.Date<=?
+            AND (E.Name IS NOT NULL OR R.Id>?)
+        ORDER BY
+            E.Name,
+            R.Id
+        LIMIT ?
+        """
+    ReminderManager_SELECT_ReminderEventChangedList = """
         SELECT
             R.Id,
             R.EventId,
@@ -78,35 +306,87 @@ class Resources:
             INNER JOIN Event AS E ON R.EventId=E.Id
         WHERE
             E.IsActive=1
+            AND (? IS NULL OR E.Id IN (SELECT rowid FROM EventSearch WHERE EventSearch MATCH ?))
             AND R.IsDone=0
-            AND R.Date<='%s'
-        ORDER BY
+            AND R.Date<=?
+            AND R.Id IN (SELECT ReminderEventId FROM ReminderEventChange WHERE Version>?)
+        """
+    ReminderManager_SELECT_ReminderEventDueList = """
+        SELECT
+            R.Id,
+            R.EventId,
+            R.Date,
             E.Name
+        FROM
+            ReminderEvent AS R
+            INNER JOIN Event AS E ON R.EventId=E.Id
+        WHERE
+            E.IsActive=1
+            AND (? IS NULL OR E.Id IN (SELECT rowid FROM EventSearch WHERE EventSearch MATCH ?))
+            AND R.IsDone=0
+            AND R.Date>?
+            AND R.Date<=?
+        """
+    ReminderManager_SELECT_UpcomingDates = """
+        SELECT DISTINCT
+            R.Date
+        FROM
+            ReminderEvent AS R
+            INNER JOIN Event AS E ON R.EventId=E.Id
+        WHERE
+            E.IsActive=1
+            AND R.IsDone=0
+            AND R.Date>?
+        """
+    ReminderManager_SELECT_ChangedUpcomingDates = """
+        SELECT DISTINCT
+            R.Date
+        FROM
+            ReminderEvent AS R
+            INNER JOIN Event AS E ON R.EventId=E.Id
+        WHERE
+            E.IsActive=1
+            AND R.IsDone=0
+            AND R.Date>?
+            AND R.Id IN (SELECT ReminderEventId FROM ReminderEventChange WHERE Version>?)
+        """
+    ReminderManager_SELECT_ChangedReminderEventIds = """
+        SELECT DISTINCT ReminderEventId FROM ReminderEventChange WHERE Version>?
+        """
+    ReminderManager_SELECT_ChangeVersion = """
+        SELECT MAX(Version) FROM ReminderEventChange
         """
-    ReminderManager_SELECT_ReminderEventDate = """
+    ReminderManager_DELETE_ReminderEventChange = """
+        DELETE FROM ReminderEventChange WHERE Version<=?
+        """
+    ReminderManager_SELECT_ReminderEventIdList = """
         SELECT
-            Date
+            Id,
+            EventId,
+            Date,
+            IsDone
         FROM
             ReminderEvent
         WHERE
-            Id=%s
+            Id IN (SELECT Id FROM temp.IdList)
         """
     ReminderManager_UPDATE_ReminderEventIsDone = """
-        UPDATE ReminderEvent SET IsDone=1 WHERE IsDone=0 AND Id=%s
+        UPDATE ReminderEvent SET IsDone=1 WHERE IsDone=0 AND Id IN (SELECT Id FROM temp.IdList)
         """
-    ReminderManager_SELECT_EventInfo = """
+    ReminderManager_SELECT_EventInfoIdList = """
         SELECT
+            Id,
             StartDate,
             IsCyclic,
             Count,
             Day,
             Month,
             IsActive,
-            (SELECT COUNT(*) FROM ReminderEvent WHERE EventId=%s AND IsDone=0) AS ReminderCount
+            (SELECT COUNT(*) FROM ReminderEvent WHERE EventId=Event.Id AND IsDone=0) AS ReminderCount
         FROM
             Event
         WHERE
-            Id=%s
+            Id IN (SELECT EventId FROM ReminderEvent WHERE Id IN (SELECT Id FROM temp.IdList))
     """
 
     EventTab_BUTTON_NAME_Add = "Add"
@@ -143,12 +423,12 @@ class Resources:
             6: "Months",
             7: "Active"
         }
-    EventTab_Property_Row = "propRow"
-    EventTab_Property_Column = "propColumn"
+    EventTab_Search_Placeholder = "Search"
+    EventTab_Search_Message = "Searching discards unsaved changes. Do you want to continue?"
 
+    # start date defaults to the current day, which EventManager sets for every new record
     EventManager_Columns_Default_Values = {
         1: "ENTER TITLE HERE",
-        2: QDate().currentDate().toString(FORMAT_DATE_STORE),
         3: 1,
         4: 1,
         5: 0,
@@ -162,46 +442,87 @@ class Resources:
     EventManager_Column_Day_Index = 5
     EventManager_Column_Month_Index = 6
     EventManager_Column_IsActive_Index = 7
+    # QSqlTableModel runs its filter as plain text, so the match can not be bound. It is safe to format in because
+    # Tools.get_search_match double quotes every word for FTS5 and EventManager.set_search doubles single quotes.
+    EventManager_FILTER_Search = "Id IN (SELECT rowid FROM EventSearch WHERE EventSearch MATCH '%s')"
     EventManager_SELECT_MaxId = """
         SELECT MAX(Id) FROM """ + TABLE_NAME_Event
-    EventManager_SELECT_Event = """
+    EventManager_SELECT_EventIdList = """
         SELECT
             Id,
-            Name,
-            StartDate,
-            IsCyclic,
             Count,
-            Day,
-            Month,
             IsActive
         FROM
-            Event """ + TABLE_NAME_Event + """
+            """ + TABLE_NAME_Event + """
         WHERE
-            Id=%s
-    """
-    EventManager_DELETE_Newest_ReminderEvents = """
-        DELETE FROM """ + TABLE_NAME_Reminder + """
-        WHERE Id IN
+            Id IN (SELECT Id FROM temp.IdList)
+        """
+    EventManager_INSERT_ReminderEventIdValueList = """
+        WITH RECURSIVE Missing (EventId, Remaining) AS
         (
-            SELECT Id FROM """ + TABLE_NAME_Reminder + """
-            WHERE IsDone=0 AND EventId=%s
-            ORDER BY Id DESC LIMIT %s
-        ) """
-    EventManager_DELETE_Event = """
-        DELETE FROM """ + TABLE_NAME_Event + """
-        WHERE Id=%s
-        """
-    EventManager_DELETE_ReminderEvent = """
+            SELECT Id, Value FROM temp.IdList WHERE Value>0
+            UNION ALL
+            SELECT EventId, Remaining-1 FROM Missing WHERE Remaining>1
+        )
+        INSERT INTO """ + TABLE_NAME_Reminder + """
+        (EventId, Date, IsDone)
+        SELECT M.EventId, E.StartDate, 0 FROM Missing AS M INNER JOIN """ + TABLE_NAME_Event + """ AS E ON M.EventId=E.Id
+        """
+    # deletes as many newest pending reminders of every event as its Value says, by counting newer pending ones
+    EventManager_DELETE_Newest_ReminderEventIdValueList = """
+        DELETE FROM """ + TABLE_NAME_Reminder + """
+        WHERE
+            IsDone=0
+            AND EventId IN (SELECT Id FROM temp.IdList)
+            AND
+            (
+                SELECT COUNT(*) FROM """ + TABLE_NAME_Reminder + """ AS N
+                WHERE N.EventId=""" + TABLE_NAME_Reminder + """.EventId AND N.IsDone=0 AND N.Id>""" + TABLE_NAME_Reminder + """.Id
+            ) < (SELECT Value FROM temp.IdList WHERE Id=""" + TABLE_NAME_Reminder + """.EventId)
+        """
+    EventManager_DELETE_ReminderEventIdList = """
         DELETE FROM """ + TABLE_NAME_Reminder + """
-        WHERE EventId=%s
+        WHERE EventId IN (SELECT Id FROM temp.IdList)
         """
 
     Manager_INSERT_ReminderEvent = """
         INSERT INTO """ + TABLE_NAME_Reminder + """
-        (EventId, Date, IsDone) VALUES (%s, %s, 0) """
-    Manager_DELETE_ReminderEvent = """
+        (EventId, Date, IsDone) VALUES (?, ?, 0) """
+    Manager_DELETE_ReminderEventIdList = """
         DELETE FROM """ + TABLE_NAME_Reminder + """
-        WHERE IsDone=0 AND EventId=%s"""
+        WHERE IsDone=0 AND EventId IN (SELECT Id FROM temp.IdList)"""
+
+    ServiceWindow_Title = "Diagnostics"
+    ServiceWindow_Columns_Names = ["Count", "Total ms", "p50 ms", "p95 ms", "Max ms", "Rows", "Query"]
+    ServiceWindow_Label_Rows = "Rows (events / reminders)"
+    ServiceWindow_Label_Files = "Database / WAL size"
+    ServiceWindow_Label_Event_Info_Cache = "Event info cache hit ratio"
+    ServiceWindow_Label_Display_Date_Cache = "Display date cache hit ratio"
+    ServiceWindow_Format_Rows = "%d / %d"
+    ServiceWindow_Format_Files = "%.1f KiB / %.1f KiB"
+    ServiceWindow_Format_Hit_Ratio = "%.1f %% (%d hits, %d misses)"
+    ServiceWindow_Format_Span = "%.1f ms (%d runs)"
+    ServiceWindow_SELECT_Row_Counts = """
+        SELECT
+            (SELECT COUNT(*) FROM """ + TABLE_NAME_Event + """),
+            (SELECT COUNT(*) FROM """ + TABLE_NAME_Reminder + """)
+        """
+
+    Diagnostics_SPAN_Reminder_Load = "Reminders load"
+    Diagnostics_SPAN_Reminder_Refresh = "Reminders refresh"
+    Diagnostics_SPAN_Reminder_Search = "Reminders search"
+    Diagnostics_SPAN_Reminder_Done = "Reminders done"
+    Diagnostics_SPAN_Event_Load = "Events load"
+    Diagnostics_SPAN_Event_Save = "Events save"
+    Diagnostics_SPAN_Event_Search = "Events search"
+
+    MainWindow_Shortcut_Diagnostics = "Ctrl+Shift+D"
+    Application_Startup_Time = "Startup time to first paint: %.1f ms"
+
+    Profiler_File_Name = "profile_%Y_%m_%d_%H_%M_%S.pstats"
+    Profiler_Format_Span = "%s[%.3f s] %.1f ms  %s\n"
+    Profiler_Format_Query = "%s    %.3f ms  %s\n"
+    Profiler_Written = "Profile written to %s"
 
     # verbose section
     Verbose_Class_Method_Name = "[control = %s] [method = %s] (name = %s) (value = %s)"
@@ -1,24 +1,133 @@
 # -*- coding: utf-8 -*-
 """
-Test window.
+Diagnostics window.
 """
 
-from PyQt5.QtWidgets import QWidget, QTableView, QVBoxLayout
-from PyQt5.QtCore import QAbstractTableModel
+import os
+from PyQt5.QtWidgets import QWidget, QTableView, QVBoxLayout, QFormLayout, QLabel, QAbstractItemView
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QStandardItemModel, QStandardItem, QShowEvent, QHideEvent
+from src.DbModel import DbModel
+from src.Diagnostics import Diagnostics
+from src.EventInfoCache import EventInfoCache
+from src.Resources import Resources
+from src.Tools import Tools, Config
 
 
 class ServiceWindow(QWidget):
     """
-    Window for service purposes.
+    Window for service purposes. Shows live query timings, cache hit ratios, table sizes and durations
+    of the last user operations. The content is refreshed on a timer while the window is visible.
     """
-    def __init__(self, model: QAbstractTableModel, window_title: str):
+    def __init__(self, db: DbModel, event_info_cache: EventInfoCache):
         super(ServiceWindow, self).__init__()
-        self.__model = model
+        self.__db = db
+        self.__event_info_cache = event_info_cache
+        self.__span_labels = {}
 
+        self.__model = QStandardItemModel()
+        self.__model.setHorizontalHeaderLabels(Resources.ServiceWindow_Columns_Names)
         self.__view = QTableView()
         self.__view.setModel(self.__model)
+        self.__view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.__view.horizontalHeader().setStretchLastSection(True)
+
+        self.__form = QFormLayout()
+        self.__rows_label = self.__add_label(Resources.ServiceWindow_Label_Rows)
+        self.__files_label = self.__add_label(Resources.ServiceWindow_Label_Files)
+        self.__event_info_cache_label = self.__add_label(Resources.ServiceWindow_Label_Event_Info_Cache)
+        self.__display_date_cache_label = self.__add_label(Resources.ServiceWindow_Label_Display_Date_Cache)
+
         self.__layout = QVBoxLayout()
+        self.__layout.addLayout(self.__form)
         self.__layout.addWidget(self.__view)
 
-        super(ServiceWindow, self).setWindowTitle(window_title)
+        self.__timer = QTimer(self)
+        self.__timer.setInterval(Config.DIAGNOSTICS_INTERVAL)
+        self.__timer.timeout.connect(self.refresh)
+
+        super(ServiceWindow, self).setWindowTitle(Resources.ServiceWindow_Title)
         super(ServiceWindow, self).setLayout(self.__layout)
+
+    def showEvent(self, event: QShowEvent):
+        """
+        Refreshes the content and starts the timer when the window is shown.
+        :param event: Show event.
+        """
+        super(ServiceWindow, self).showEvent(event)
+        self.refresh()
+        self.__timer.start()
+
+    def hideEvent(self, event: QHideEvent):
+        """
+        Stops the timer when the window is hidden.
+        :param event: Hide event.
+        """
+        self.__timer.stop()
+        super(ServiceWindow, self).hideEvent(event)
+
+    def refresh(self):
+        """
+        Reads current diagnostics and shows them.
+        """
+        self.__refresh_rows()
+        self.__refresh_files()
+        self.__refresh_caches()
+        self.__refresh_spans()
+        self.__refresh_statistics()
+        Tools.write_verbose_class_name(self, "Diagnostics refreshed")
+
+    def __add_label(self, name: str) -> QLabel:
+        label = QLabel()
+        self.__form.addRow(name, label)
+        return label
+
+    def __refresh_rows(self):
+        query = self.__db.exec_prepared(Resources.ServiceWindow_SELECT_Row_Counts)
+        if query.next():
+            self.__rows_label.setText(Resources.ServiceWindow_Format_Rows % (query.value(0), query.value(1)))
+        query.finish()
+
+    def __refresh_files(self):
+        path = self.__db.path
+        self.__files_label.setText(Resources.ServiceWindow_Format_Files % (
+            ServiceWindow.__get_file_size(path) / 1024, ServiceWindow.__get_file_size(path + "-wal") / 1024))
+
+    def __refresh_caches(self):
+        self.__event_info_cache_label.setText(ServiceWindow.__get_hit_ratio_text(
+            self.__event_info_cache.hits, self.__event_info_cache.misses))
+        info = Tools.get_display_date.cache_info()
+        self.__display_date_cache_label.setText(ServiceWindow.__get_hit_ratio_text(info.hits, info.misses))
+
+    def __refresh_spans(self):
+        for name, (duration, count) in sorted(Diagnostics.get_spans().items()):
+            label = self.__span_labels.get(name)
+            if label is None:
+                label = self.__add_label(name)
+                self.__span_labels[name] = label
+            label.setText(Resources.ServiceWindow_Format_Span % (duration * 1000, count))
+
+    def __refresh_statistics(self):
+        items = self.__db.statistics.get_items()
+        self.__model.setRowCount(len(items))
+        for row, item in enumerate(items):
+            values = [
+                "%d" % item["count"], "%.2f" % (item["total"] * 1000), "%.3f" % (item["p50"] * 1000),
+                "%.3f" % (item["p95"] * 1000), "%.3f" % (item["max"] * 1000), "%d" % item["rows_affected"],
+                item["template"]
+            ]
+            for column, value in enumerate(values):
+                self.__model.setItem(row, column, QStandardItem(value))
+
+    @staticmethod
+    def __get_hit_ratio_text(hits: int, misses: int) -> str:
+        total = hits + misses
+        ratio = hits * 100 / total if total else 0.0
+        return Resources.ServiceWindow_Format_Hit_Ratio % (ratio, hits, misses)
+
+    @staticmethod
+    def __get_file_size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
@@ -3,8 +3,13 @@
 Library to store and access configuration and log.
 """
 
+import atexit
+import threading
 from enum import Enum
-from PyQt5.QtCore import QDir, QDateTime, QFile, QTextStream, QDate
+from functools import lru_cache
+from typing import Optional
+from PyQt5.QtCore import QDir, QDateTime, QDate
+from src.LogWriter import LogWriter
 from src.Resources import Resources
 
 
@@ -27,12 +32,93 @@ class Config:
     Config consts.
     """
     EXECUTED_TYPE = ExecutedType.Silent
+    IS_VERBOSE = False
+    """
+    Cached check of verbose executed type, read by every verbose call.
+    """
     ROOT_DIR = ""
     ICON_PATH = "icon.png"
     LOG_PATH = "log/"
+    LOG_MAX_SIZE = 10 * 1024 * 1024
+    """
+    Size in bytes after which the log file is rotated.
+    """
     DB_PATH = "db/"
     DB_NAME = "maindb"
     DB_TYPE = "QSQLITE"
+    DB_PROFILE = "durable"
+    DB_PROFILES = {
+        "durable": {
+            "journal_mode": "WAL",
+            "synchronous": "FULL",
+            "cache_size": -8000,
+            "mmap_size": 0,
+            "temp_store": "DEFAULT",
+            "busy_timeout": 5000
+        },
+        "fast": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -32000,
+            "mmap_size": 268435456,
+            "temp_store": "MEMORY",
+            "busy_timeout": 5000
+        }
+    }
+    """
+    SQLite pragmas applied on opening the database. Negative cache_size is in KiB, mmap_size is in bytes.
+    """
+    SLOW_QUERY_THRESHOLD = 100
+    """
+    Execution time in milliseconds from which a query is written to the query log with its plan.
+    """
+    QUERY_STATISTICS_SAMPLES = 1024
+    """
+    Number of the latest durations per query template that percentiles are computed from.
+    """
+    EVENT_INFO_CACHE_SIZE = 1024
+    REMINDER_PAGE_SIZE = 256
+    """
+    Number of reminders loaded at once. Next pages are loaded while the list is scrolled.
+    """
+    DISPLAY_DATE_CACHE_SIZE = 4096
+    """
+    Number of distinct dates which display texts are kept for.
+    """
+    SCHEDULER_MAX_INTERVAL = 60 * 60 * 1000
+    """
+    Longest time in milliseconds the reminder scheduler waits before it checks the date again.
+    It bounds how late reminders are shown after the machine resumes from suspend.
+    """
+    SEARCH_DELAY = 300
+    """
+    Time in milliseconds after the last keystroke in a search box before the search is run.
+    """
+    DIAGNOSTICS = False
+    """
+    Whether the diagnostics window is shown on start. It can also be opened by MainWindow's shortcut.
+    """
+    DIAGNOSTICS_INTERVAL = 2000
+    """
+    Time in milliseconds between refreshes of the diagnostics window while it is visible.
+    """
+    STARTUP_BENCHMARK = False
+    """
+    Whether the app prints and logs the time from start to the first paint of the main window and quits.
+    """
+    PROFILE_PATH = None
+    """
+    Path of the profile file written when the app is closed. None if the app is not profiled.
+    An empty string means the default file in the log directory.
+    """
+    PROFILE_SAMPLE_INTERVAL = 0.005
+    """
+    Time in seconds between two stack samples while the app is profiled.
+    """
+    PROFILE_SPANS_LIMIT = 100000
+    """
+    Maximal number of user operations recorded while the app is profiled.
+    """
     WINDOW_HEIGHT = 600
     WINDOW_WIDTH = 800
     WINDOW_TITLE = "Reminder"
@@ -58,6 +144,16 @@ class Config:
         :param new_type: New type.
         """
         Config.EXECUTED_TYPE = new_type
+        Config.IS_VERBOSE = new_type == ExecutedType.Verbose
+
+    @staticmethod
+    def set_db_profile(name: str):
+        """
+        Sets database performance profile. Unknown profile names are ignored.
+        :param name: Name of one of DB_PROFILES.
+        """
+        if name in Config.DB_PROFILES:
+            Config.DB_PROFILE = name
 
 
 class Tools:
@@ -65,13 +161,16 @@ class Tools:
     Class with useful methods.
     """
 
+    __log_writers = {}
+    __log_writers_lock = threading.Lock()
+
     @staticmethod
     def is_verbose() -> bool:
         """
         Returns whether current executed type is verbose.
         :return: True if current executed type is verbose, False otherwise.
         """
-        return Config.EXECUTED_TYPE == ExecutedType.Verbose
+        return Config.IS_VERBOSE
 
     @staticmethod
     def check_path(path: str):
@@ -99,42 +198,58 @@ class Tools:
         Tools.check_path(Config.LOG_PATH)
 
     @staticmethod
-    def write_verbose_class_name(instance: object, message: str):
+    def write_verbose_class_name(instance: object, message: str, *args):
         """
         Writes verbose message. Message started from class name.
+        The message is formatted only in verbose mode.
         :param instance: Class instance.
-        :param message: Message to write.
-        :return:
+        :param message: Message to write, with '%' placeholders for args.
+        :param args: Values formatted into the message.
         """
-        new_message = Resources.Verbose_Class_Name % (instance.__class__.__name__, message)
-        Tools.write_verbose(new_message)
+        if not Config.IS_VERBOSE:
+            return
+
+        if args:
+            message = message % args
+        Tools.write_verbose(Resources.Verbose_Class_Name % (instance.__class__.__name__, message))
 
     @staticmethod
-    def write_verbose_class_method_name(instance: object, method: object, name: str, value: str):
+    def write_verbose_class_method_name(instance: object, method: object, name: str, value: object):
         """
         Writes verbose message for setter method.
+        Nothing is converted to string in silent mode, so callers pass raw values.
         :param instance: Class instance.
         :param method: Caller method.
         :param name: Property name.
-        :param value: Property value.
+        :param value: Property value. A callable is called to get the value, only in verbose mode.
         """
+        if not Config.IS_VERBOSE:
+            return
+
         if isinstance(method, str):
             method_name = method
         else:
             method_name = str(method.__name__)
+        if callable(value):
+            value = value()
 
         Tools.write_verbose(Resources.Verbose_Class_Method_Name % (instance.__class__.__name__, method_name, name, value))
 
     @staticmethod
-    def write_verbose(message):
+    def write_verbose(message, *args):
         """
         If the app is executed in verbose mode writes message to current log file and prints it on the output.
         If the app is executed in silent mode does nothing.
-        :param message: Message to write.
+        :param message: Message to write, with '%' placeholders for args. A callable is called to get the message, only in verbose mode.
+        :param args: Values formatted into the message.
         """
-        if not Tools.is_verbose():
+        if not Config.IS_VERBOSE:
             return
 
+        if callable(message):
+            message = message()
+        if args:
+            message = message % args
         end_message = Tools.prepare_message_string(message)
         Tools.write_to_log_file(end_message)
         print(end_message)
@@ -159,14 +274,49 @@ class Tools:
             print(end_message)
 
     @staticmethod
-    def get_date_from_string(string: str) -> QDate:
+    def get_search_match(text: str) -> Optional[str]:
+        """
+        Returns FTS5 query matching names which contain words starting with every word of given text.
+        Words are quoted, so the text never breaks the query syntax.
+        :param text: Text typed by the user.
+        :return: FTS5 query or None if there is nothing to search.
+        """
+        words = text.split()
+        if not words:
+            return None
+
+        return " ".join('"%s"*' % word.replace('"', '""') for word in words)
+
+    @staticmethod
+    def is_valid_day(day) -> bool:
+        """
+        Returns whether given value is a Julian day number a date can be computed from.
+        :param day: Value read from a date column, it can be None or text in a damaged database.
+        :return: True if day is a positive integer.
+        """
+        return isinstance(day, int) and not isinstance(day, bool) and day > 0
+
+    @staticmethod
+    def get_date_from_day(day: int) -> QDate:
+        """
+        Returns date from given Julian day number, the format dates are stored in.
+        :param day: Julian day number.
+        :return: Date. Invalid date if day is empty.
+        """
+        if not day:
+            return QDate()
+
+        return QDate.fromJulianDay(int(day))
+
+    @staticmethod
+    @lru_cache(maxsize=Config.DISPLAY_DATE_CACHE_SIZE)
+    def get_display_date(day: int) -> str:
         """
-        Returns date from given string.
-        Uses FORMAT_DATE_STORE.
-        :param string: String to convert.
-        :return: Date.
+        Returns display text of a date given as Julian day number. Texts are cached, a view repaints the same few dates many times.
+        :param day: Julian day number.
+        :return: Date in display format. Empty text if day is empty.
         """
-        return QDate.fromString(string, Resources.FORMAT_DATE_STORE)
+        return Tools.get_date_from_day(day).toString(Resources.FORMAT_DATE_DISPLAY)
 
     @staticmethod
     def get_current_date() -> QDate:
@@ -177,6 +327,14 @@ class Tools:
         current_date = QDate()
         return current_date.currentDate()
 
+    @staticmethod
+    def get_current_day() -> int:
+        """
+        Returns current date as Julian day number.
+        :return: Current Julian day number.
+        """
+        return Tools.get_current_date().toJulianDay()
+
     @staticmethod
     def prepare_message_string(message) -> str:
         """
@@ -197,14 +355,42 @@ class Tools:
     @staticmethod
     def write_to_log_file(message: str):
         """
-        Writes given message to current log file.
+        Queues given message to be written to current log file by the background writer.
+        :param message: Message to write.
+        """
+        Tools.__get_log_writer(Resources.LOG_NAME_Main).write(message)
+
+    @staticmethod
+    def write_query_log(message):
+        """
+        Writes message to current query log file, which collects slow queries and query statistics.
         :param message: Message to write.
         """
-        log_path = Config.LOG_PATH + "log_" + QDateTime().currentDateTime().toString("yyyy_MM_dd") + ".log"
-        current_file = QFile(log_path)
-        try:
-            current_file.open(QFile.WriteOnly | QFile.Append)
-            stream = QTextStream(current_file)
-            stream << message
-        finally:
-            current_file.close()
+        end_message = Tools.prepare_message_string(message)
+        if end_message:
+            Tools.__get_log_writer(Resources.LOG_NAME_Query).write(end_message)
+
+    @staticmethod
+    def close_log():
+        """
+        Writes all queued messages to the log files and stops the background writers.
+        """
+        with Tools.__log_writers_lock:
+            log_writers = list(Tools.__log_writers.values())
+            Tools.__log_writers.clear()
+
+        for log_writer in log_writers:
+            log_writer.close()
+
+    @staticmethod
+    def __get_log_writer(name: str) -> LogWriter:
+        with Tools.__log_writers_lock:
+            log_writer = Tools.__log_writers.get(name)
+            if log_writer is None:
+                if not Tools.__log_writers:
+                    atexit.register(Tools.close_log)
+                log_writer = LogWriter(Config.LOG_PATH, Config.LOG_MAX_SIZE, name)
+                log_writer.start()
+                Tools.__log_writers[name] = log_writer
+
+        return log_writer
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Shared test setup. Tests run against temporary databases with an offscreen Qt application.
+"""
+
+import itertools
+import os
+import tempfile
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from src.Tools import Tools, Config
+
+ROOT_DIR = tempfile.mkdtemp()
+Config.DB_PATH = os.path.join(ROOT_DIR, "db") + "/"
+Config.LOG_PATH = os.path.join(ROOT_DIR, "log") + "/"
+Tools.check_paths()
+APPLICATION = QApplication.instance() or QApplication([])
+DB_NUMBERS = itertools.count(1)
+
+
+@pytest.fixture
+def db():
+    """
+    Returns a new database model of an empty database.
+    """
+    from src.DbModel import DbModel
+    model = DbModel("test_%d" % next(DB_NUMBERS))
+    yield model
+    model.close_connection()
+
+
+@pytest.fixture
+def event_info_cache():
+    """
+    Returns a new empty event info cache.
+    """
+    from src.EventInfoCache import EventInfoCache
+    return EventInfoCache()
+
+
+def select_all(db, query_string: str) -> list:
+    """
+    Returns all rows of a query as tuples.
+    """
+    query = db.exec(query_string)
+    rows = []
+    while query.next():
+        rows.append(tuple(None if query.isNull(i) else query.value(i) for i in range(query.record().count())))
+    query.finish()
+    return rows
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of Application.
+"""
+
+import glob
+import os
+import tempfile
+import src.Application
+from src.Application import Application
+from src.Tools import Config
+from tests.conftest import APPLICATION
+
+
+def test_startup_benchmark_writes_query_statistics(monkeypatch):
+    root_dir = tempfile.mkdtemp()
+    for name in ("ROOT_DIR", "ICON_PATH", "LOG_PATH", "DB_PATH", "STARTUP_BENCHMARK"):
+        monkeypatch.setattr(Config, name, getattr(Config, name))
+    Config.ICON_PATH, Config.LOG_PATH, Config.DB_PATH = "icon.png", "log/", "db/"
+    monkeypatch.setattr(src.Application, "QApplication", lambda params: APPLICATION)
+
+    result = Application.run([os.path.join(root_dir, "Reminder.py"), "--startup-benchmark"])
+
+    assert result == 0
+    query_logs = glob.glob(os.path.join(root_dir, "log", "query_*.log"))
+    assert len(query_logs) == 1
+    with open(query_logs[0], encoding="utf-8") as file:
+        assert "total ms" in file.read()
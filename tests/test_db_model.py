@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of DbModel schema migrations.
+"""
+
+import sqlite3
+from src.DbModel import DbModel
+from src.Resources import Resources
+from src.Tools import Config
+from tests.conftest import select_all, DB_NUMBERS
+
+BASELINE_SCHEMA = [
+    """
+    CREATE TABLE Event
+    (
+        Id INTEGER PRIMARY KEY,
+        Name VARCHAR,
+        StartDate VARCHAR,
+        IsCyclic INTEGER,
+        Count INTEGER,
+        Day INTEGER,
+        Month INTEGER,
+        IsActive INTEGER
+    )
+    """,
+    """
+    CREATE TABLE ReminderEvent
+    (
+        Id INTEGER PRIMARY KEY,
+        EventId INTEGER,
+        Date VARCHAR,
+        IsDone INTEGER
+    )
+    """
+]
+
+
+def create_baseline_db(name: str):
+    """
+    Creates a database the way the first released version did, with dates stored as yyyyMMdd strings.
+    """
+    connection = sqlite3.connect(Config.DB_PATH + name)
+    for statement in BASELINE_SCHEMA:
+        connection.execute(statement)
+    connection.executemany(
+        "INSERT INTO Event (Id, Name, StartDate, IsCyclic, Count, Day, Month, IsActive) VALUES (?, ?, ?, 0, 1, 0, 0, 1)",
+        [(1, "valid", "20260131"), (2, "empty", ""), (3, "null", None), (4, "malformed", "31.01.2026")])
+    connection.executemany(
+        "INSERT INTO ReminderEvent (Id, EventId, Date, IsDone) VALUES (?, ?, ?, 0)",
+        [(1, 1, "20260131"), (2, 2, ""), (3, 3, None), (4, 4, "2026")])
+    connection.commit()
+    connection.close()
+
+
+def test_baseline_dates_are_migrated_to_julian_days(monkeypatch):
+    name = "baseline_%d" % next(DB_NUMBERS)
+    create_baseline_db(name)
+    logged = []
+    monkeypatch.setattr("src.DbModel.Tools.write_log", logged.append)
+
+    db = DbModel(name)
+    try:
+        assert select_all(db, "SELECT Id, StartDate, typeof(StartDate) FROM Event ORDER BY Id") == [
+            (1, 2461072, "integer"), (2, None, "null"), (3, None, "null"), (4, None, "null")]
+        assert select_all(db, "SELECT Id, Date, typeof(Date) FROM ReminderEvent ORDER BY Id") == [
+            (1, 2461072, "integer"), (2, None, "null"), (3, None, "null"), (4, None, "null")]
+        assert select_all(db, "SELECT MAX(Version) FROM SchemaVersion") == [(len(Resources.DbModel_Migrations),)]
+
+        indexes = {row[0] for row in select_all(db, "SELECT name FROM sqlite_master WHERE type='index'")}
+        assert {"ReminderEvent_EventId_IsDone", "ReminderEvent_IsDone_Date", "Event_Name"} <= indexes
+        assert Resources.DbModel_Migrations_Checks[2][1] % 2 in logged
+    finally:
+        db.close_connection()
+
+
+def test_new_database_logs_no_lost_dates(monkeypatch):
+    logged = []
+    monkeypatch.setattr("src.DbModel.Tools.write_log", logged.append)
+
+    db = DbModel("test_%d" % next(DB_NUMBERS))
+    try:
+        assert select_all(db, "SELECT MAX(Version) FROM SchemaVersion") == [(len(Resources.DbModel_Migrations),)]
+        assert not any("yyyyMMdd" in message for message in logged)
+    finally:
+        db.close_connection()
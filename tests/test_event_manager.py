@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of EventManager saving and the reminders it adds or deletes.
+"""
+
+import pytest
+from src.DbModel import DbModel
+from src.EventManager import EventManager
+from src.Resources import Resources
+from src.Tools import Tools
+from tests.conftest import select_all
+
+COUNT = Resources.EventManager_Column_Count_Index
+IS_ACTIVE = Resources.EventManager_Column_IsActive_Index
+
+
+@pytest.fixture
+def manager(db, event_info_cache) -> EventManager:
+    manager = EventManager(db, event_info_cache)
+    manager.model.select()
+    return manager
+
+
+def add_event(manager: EventManager, count: int, is_active: bool = True) -> int:
+    row = manager.insert_row()
+    manager.model.setData(manager.model.index(row, COUNT), count)
+    manager.model.setData(manager.model.index(row, IS_ACTIVE), int(is_active))
+    manager.save()
+    return manager.model.record(row).value(0)
+
+
+def set_value(manager: EventManager, event_id: int, column: int, value: int):
+    model = manager.model
+    row = next(row for row in range(model.rowCount()) if model.record(row).value(0) == event_id)
+    model.setData(model.index(row, column), value)
+    manager.save()
+
+
+def pending_ids(db: DbModel, event_id: int) -> list:
+    rows = select_all(db, "SELECT Id FROM ReminderEvent WHERE IsDone=0 AND EventId=%d ORDER BY Id" % event_id)
+    return [row[0] for row in rows]
+
+
+def test_add_active_event_adds_reminders_on_start_date(db, manager):
+    event_id = add_event(manager, 3)
+
+    assert select_all(db, "SELECT EventId, Date, IsDone FROM ReminderEvent") == [(event_id, Tools.get_current_day(), 0)] * 3
+
+
+def test_add_inactive_event_adds_no_reminders(db, manager):
+    add_event(manager, 3, is_active=False)
+
+    assert select_all(db, "SELECT * FROM ReminderEvent") == []
+
+
+def test_count_up_adds_missing_reminders(db, manager):
+    event_id = add_event(manager, 1)
+
+    set_value(manager, event_id, COUNT, 4)
+
+    assert len(pending_ids(db, event_id)) == 4
+
+
+def test_count_down_deletes_newest_pending_reminders(db, manager):
+    event_id = add_event(manager, 4)
+    other_id = add_event(manager, 2)
+    first_ids = pending_ids(db, event_id)
+    db.exec("INSERT INTO ReminderEvent (Id, EventId, Date, IsDone) VALUES (100, %d, %d, 1)" % (event_id, Tools.get_current_day()))
+
+    set_value(manager, event_id, COUNT, 2)
+
+    assert pending_ids(db, event_id) == first_ids[:2]
+    assert select_all(db, "SELECT Id FROM ReminderEvent WHERE IsDone=1") == [(100,)]
+    assert len(pending_ids(db, other_id)) == 2
+
+
+def test_count_change_of_inactive_event_changes_nothing(db, manager):
+    event_id = add_event(manager, 2, is_active=False)
+
+    set_value(manager, event_id, COUNT, 5)
+
+    assert pending_ids(db, event_id) == []
+
+
+def test_deactivate_deletes_pending_reminders_only(db, manager):
+    event_id = add_event(manager, 3)
+    done_id = pending_ids(db, event_id)[0]
+    db.exec("UPDATE ReminderEvent SET IsDone=1 WHERE Id=%d" % done_id)
+
+    set_value(manager, event_id, IS_ACTIVE, 0)
+
+    assert select_all(db, "SELECT Id FROM ReminderEvent WHERE EventId=%d" % event_id) == [(done_id,)]
+
+
+def test_activate_adds_count_reminders(db, manager):
+    event_id = add_event(manager, 2, is_active=False)
+
+    set_value(manager, event_id, IS_ACTIVE, 1)
+
+    assert len(pending_ids(db, event_id)) == 2
+
+
+def test_delete_event_deletes_all_its_reminders(db, manager):
+    event_id = add_event(manager, 2)
+    other_id = add_event(manager, 1)
+
+    manager.remove_rows([manager.model.index(0, 0)])
+    manager.save()
+
+    assert select_all(db, "SELECT EventId FROM ReminderEvent") == [(other_id,)]
+    assert event_id != other_id
+
+
+def test_id_list_is_filled_in_chunks(db):
+    ids = list(range(1, DbModel.ID_LIST_CHUNK_SIZE * 2 + 8))
+    db.set_id_list(ids + ids[:5])
+    assert select_all(db, "SELECT Id FROM temp.IdList ORDER BY Id") == [(index,) for index in ids]
+
+    db.set_id_value_list([(index, index * 10) for index in ids])
+    assert select_all(db, "SELECT Id, Value FROM temp.IdList ORDER BY Id") == [(index, index * 10) for index in ids]
+
+    db.set_id_list([])
+    assert select_all(db, "SELECT Id FROM temp.IdList") == []
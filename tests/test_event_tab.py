@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of EventTab.
+"""
+
+from PyQt5.QtCore import QItemSelectionModel
+from PyQt5.QtWidgets import QMessageBox
+from src.EventTab import EventTab
+from src.Tools import Tools
+from tests.conftest import select_all
+
+
+def add_events(db, count: int):
+    start_day = Tools.get_current_day() - 1
+    for event_id in range(1, count + 1):
+        db.exec("INSERT INTO Event (Id, Name, StartDate, IsCyclic, Count, Day, Month, IsActive) "
+                "VALUES (%d, 'Event %d', %d, 1, 1, 7, 0, 1)" % (event_id, event_id, start_day))
+        db.exec("INSERT INTO ReminderEvent (EventId, Date, IsDone) VALUES (%d, %d, 0)" % (event_id, start_day))
+
+
+def test_delete_selected_rows(db, event_info_cache, monkeypatch):
+    add_events(db, 4)
+    tab = EventTab(db, event_info_cache)
+    view = tab._EventTab__view
+    model = view.model()
+    for row in (0, 2, 3):
+        view.selectionModel().select(model.index(row, 1), QItemSelectionModel.Select | QItemSelectionModel.Rows)
+    monkeypatch.setattr(QMessageBox, "warning", lambda *args: QMessageBox.Yes)
+
+    tab._EventTab__delete_clicked()
+    tab._EventTab__save_clicked()
+
+    assert select_all(db, "SELECT Id FROM Event") == [(2,)]
+    assert select_all(db, "SELECT EventId FROM ReminderEvent") == [(2,)]
+
+
+def test_click_selects_row(db, event_info_cache):
+    add_events(db, 2)
+    tab = EventTab(db, event_info_cache)
+    view = tab._EventTab__view
+
+    view.selectRow(1)
+
+    assert [index.row() for index in view.selectionModel().selectedRows()] == [1]
+
+
+def search(tab: EventTab, text: str):
+    tab._EventTab__search_edit.setText(text)
+    tab._EventTab__search_timer.stop()
+    tab._EventTab__search()
+
+
+def test_search_with_quotes(db, event_info_cache):
+    add_events(db, 2)
+    db.exec("UPDATE Event SET Name='O''Brien \"Jr\"' WHERE Id=2")
+    tab = EventTab(db, event_info_cache)
+    model = tab._EventTab__view.model()
+
+    search(tab, "o'brien \"jr")
+    assert [model.index(row, 0).data() for row in range(model.rowCount())] == [2]
+
+    search(tab, "' OR 1=1 --")
+    assert model.rowCount() == 0
+
+
+def test_declined_search_restores_text(db, event_info_cache, monkeypatch):
+    add_events(db, 2)
+    tab = EventTab(db, event_info_cache)
+    search(tab, "event")
+    tab._EventTab__add_clicked()
+    monkeypatch.setattr(QMessageBox, "warning", lambda *args: QMessageBox.No)
+
+    search(tab, "other")
+
+    assert tab._EventTab__search_edit.text() == "event"
+    assert not tab._EventTab__search_timer.isActive()
+    assert tab._EventTab__view.model().rowCount() == 3
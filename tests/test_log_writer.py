@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of LogWriter.
+"""
+
+import os
+import tempfile
+import time
+from datetime import date
+from src.LogWriter import LogWriter
+
+
+def read_current_log(log_dir: str) -> str:
+    name = LogWriter.FILE_NAME % ("log", date.today().strftime(LogWriter.FORMAT_DAY))
+    with open(os.path.join(log_dir, name), encoding="utf-8") as file:
+        return file.read()
+
+
+def test_writes_when_old_file_can_not_be_compressed():
+    log_dir = tempfile.mkdtemp()
+    os.mkdir(os.path.join(log_dir, "log_2000_01_01.log"))  # opening it for compression fails
+    writer = LogWriter(log_dir, 1024 * 1024)
+    writer.start()
+
+    writer.write("message\n")
+    writer.close()
+
+    assert not writer.is_alive()
+    assert read_current_log(log_dir) == "message\n"
+
+
+def test_survives_missing_log_dir():
+    log_dir = os.path.join(tempfile.mkdtemp(), "missing")
+    writer = LogWriter(log_dir, 1024 * 1024)
+    writer.start()
+    writer.write("lost\n")
+    time.sleep(0.2)  # the writer has tried to compress old files and to write by now
+
+    assert writer.is_alive()
+    start = time.perf_counter()
+    writer.close()
+    assert not writer.is_alive()
+    assert time.perf_counter() - start < 1
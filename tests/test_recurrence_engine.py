@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of RecurrenceEngine.
+"""
+
+import numpy
+from PyQt5.QtCore import QDate
+from src.RecurrenceEngine import RecurrenceEngine
+
+
+def advance(date: str, days: int, months: int) -> str:
+    result = RecurrenceEngine.advance(numpy.array([date], dtype="datetime64[D]"), [days], [months])
+    return str(result[0])
+
+
+def test_advance_by_days_only():
+    assert advance("2026-12-30", 3, 0) == "2027-01-02"
+
+
+def test_advance_clamps_to_month_end():
+    assert advance("2026-01-31", 0, 1) == "2026-02-28"
+    assert advance("2026-03-31", 0, 1) == "2026-04-30"
+    assert advance("2026-08-31", 0, 6) == "2027-02-28"
+
+
+def test_advance_in_leap_years():
+    assert advance("2024-01-31", 0, 1) == "2024-02-29"
+    assert advance("2024-02-29", 0, 12) == "2025-02-28"
+    assert advance("2023-02-28", 0, 12) == "2024-02-28"
+    assert advance("2024-02-28", 1, 0) == "2024-02-29"
+
+
+def test_advance_adds_days_after_months():
+    assert advance("2026-01-31", 1, 1) == "2026-03-01"
+
+
+def test_advance_matches_qdate():
+    start = QDate(2023, 1, 1)
+    starts = [start.addDays(offset) for offset in range(0, 800, 7)]
+    cycles = [(days, months) for days in (0, 1, 30) for months in (0, 1, 2, 12)]
+    for days, months in cycles:
+        julian_days = [date.toJulianDay() for date in starts]
+        result = RecurrenceEngine.advance(RecurrenceEngine.from_julian_days(julian_days), days, months)
+        expected = [date.addMonths(months).addDays(days).toJulianDay() for date in starts]
+        assert RecurrenceEngine.to_julian_days(result).tolist() == expected
+
+
+def test_julian_day_conversion_round_trip():
+    julian_days = [QDate(1970, 1, 1).toJulianDay(), QDate(2024, 2, 29).toJulianDay()]
+    dates = RecurrenceEngine.from_julian_days(julian_days)
+    assert [str(date) for date in dates] == ["1970-01-01", "2024-02-29"]
+    assert RecurrenceEngine.to_julian_days(dates).tolist() == julian_days
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of ReminderManager.
+"""
+
+from src.ReminderManager import ReminderManager
+from src.Tools import Tools, Config
+from tests.conftest import select_all
+
+
+def test_set_done_many_skips_reminder_without_date(db, event_info_cache):
+    start_day = Tools.get_current_day() - 30
+    db.exec("INSERT INTO Event (Id, Name, StartDate, IsCyclic, Count, Day, Month, IsActive) "
+            "VALUES (1, 'Cyclic', %d, 1, 2, 7, 0, 1)" % start_day)
+    db.exec("INSERT INTO ReminderEvent (Id, EventId, Date, IsDone) VALUES (1, 1, NULL, 0)")
+    db.exec("INSERT INTO ReminderEvent (Id, EventId, Date, IsDone) VALUES (2, 1, %d, 0)" % start_day)
+    manager = ReminderManager(db, event_info_cache)
+
+    manager.set_done_many([(1, 1), (2, 1)])
+
+    assert select_all(db, "SELECT Id FROM ReminderEvent WHERE IsDone=1 ORDER BY Id") == [(1,), (2,)]
+    assert select_all(db, "SELECT Date FROM ReminderEvent WHERE IsDone=0") == [(start_day + 7,), (start_day + 7,)]
+
+
+def test_set_done_of_only_reminder_without_date_adds_nothing(db, event_info_cache):
+    db.exec("INSERT INTO Event (Id, Name, StartDate, IsCyclic, Count, Day, Month, IsActive) "
+            "VALUES (1, 'Cyclic', %d, 1, 1, 7, 0, 1)" % (Tools.get_current_day() - 30))
+    db.exec("INSERT INTO ReminderEvent (Id, EventId, Date, IsDone) VALUES (1, 1, NULL, 0)")
+    manager = ReminderManager(db, event_info_cache)
+
+    manager.set_done(1, 1)
+
+    assert select_all(db, "SELECT Id, IsDone FROM ReminderEvent") == [(1, 1)]
+
+
+def test_set_done_of_event_with_null_columns(db, event_info_cache):
+    start_day = Tools.get_current_day() - 30
+    db.exec("INSERT INTO Event (Id, Name, StartDate, IsCyclic, Count, Day, Month, IsActive) "
+            "VALUES (1, 'No start date', NULL, 1, 1, 7, NULL, 1)")
+    db.exec("INSERT INTO Event (Id, Name, StartDate, IsCyclic, Count, Day, Month, IsActive) "
+            "VALUES (2, 'No count', %d, 1, NULL, NULL, NULL, 1)" % start_day)
+    db.exec("INSERT INTO ReminderEvent (Id, EventId, Date, IsDone) VALUES (1, 1, %d, 0)" % start_day)
+    db.exec("INSERT INTO ReminderEvent (Id, EventId, Date, IsDone) VALUES (2, 2, %d, 0)" % start_day)
+    manager = ReminderManager(db, event_info_cache)
+
+    manager.set_done(1, 1)
+    manager.set_done(2, 2)
+
+    assert select_all(db, "SELECT Id, IsDone FROM ReminderEvent WHERE Id IN (1, 2) ORDER BY Id") == [(1, 1), (2, 1)]
+    assert select_all(db, "SELECT EventId, Date FROM ReminderEvent WHERE IsDone=0") == [(1, start_day + 7)]
+
+
+EVENT_NAMES = [None, "", "Ärger", "alpha", "Beta", "beta", "Zebra", None, "日本"]
+
+
+def add_named_events(db) -> int:
+    today = Tools.get_current_day()
+    reminder_id = 1
+    for event_id, name in enumerate(EVENT_NAMES, 1):
+        db.exec_prepared("INSERT INTO Event (Id, Name, StartDate, IsCyclic, Count, Day, Month, IsActive) "
+                         "VALUES (?, ?, ?, 1, 2, 7, 0, 1)", event_id, name, today - 10)
+        for offset in (10, 5, -5):  # the last one is not due yet
+            db.exec("INSERT INTO ReminderEvent (Id, EventId, Date, IsDone) VALUES (%d, %d, %d, 0)"
+                    % (reminder_id, event_id, today - offset))
+            reminder_id += 1
+
+    return today
+
+
+def read_all_rows(db, today: int) -> list:
+    return select_all(db, "SELECT R.Id, R.EventId, R.Date, E.Name FROM Event AS E INNER JOIN ReminderEvent AS R "
+                          "ON R.EventId=E.Id WHERE E.IsActive=1 AND R.IsDone=0 AND R.Date<=%d ORDER BY E.Name, R.Id" % today)
+
+
+def read_model_rows(manager: ReminderManager) -> list:
+    model = manager.model
+    while model.canFetchMore():
+        model.fetchMore()
+    return [model.record(row) for row in range(model.rowCount())]
+
+
+def test_pages_and_changes_match_full_query(db, event_info_cache, monkeypatch):
+    monkeypatch.setattr(Config, "REMINDER_PAGE_SIZE", 3)
+    today = add_named_events(db)
+    manager = ReminderManager(db, event_info_cache)
+    assert manager.model.rowCount() == 3
+    assert read_model_rows(manager) == read_all_rows(db, today)
+
+    manager.set_done_many([(1, 1), (4, 2), (13, 5)])
+    db.exec("UPDATE Event SET Name='aaa' WHERE Id=7")
+    db.exec("UPDATE Event SET Name=NULL WHERE Id=3")
+    manager.refresh_changes()
+
+    assert read_model_rows(manager) == read_all_rows(db, today)
+
+
+def test_changes_past_loaded_page_are_read_by_later_pages(db, event_info_cache, monkeypatch):
+    monkeypatch.setattr(Config, "REMINDER_PAGE_SIZE", 3)
+    today = add_named_events(db)
+    manager = ReminderManager(db, event_info_cache)
+
+    db.exec("UPDATE Event SET Name='Zz' WHERE Id=1")  # moves reminders of a loaded NULL name past the page
+    manager.set_done_many([(22, 8), (25, 9)])
+    db.exec("UPDATE Event SET Name=NULL WHERE Id=9")  # moves reminders into the loaded page
+    manager.refresh_changes()
+
+    assert read_model_rows(manager) == read_all_rows(db, today)
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of ReminderScheduler.
+"""
+
+from src.ReminderScheduler import ReminderScheduler
+from src.Tools import Tools, Config
+
+
+def test_long_wait_is_split_into_steps():
+    scheduler = ReminderScheduler()
+
+    scheduler.schedule([Tools.get_current_day() + 20])
+
+    timer = scheduler._ReminderScheduler__timer
+    assert timer.isActive()
+    assert 0 < timer.interval() <= Config.SCHEDULER_MAX_INTERVAL
+
+
+def test_step_without_due_date_rearms():
+    scheduler = ReminderScheduler()
+    emitted = []
+    scheduler.due_signal.connect(emitted.append)
+    scheduler.schedule([Tools.get_current_day() + 2])
+
+    scheduler._ReminderScheduler__timeout()
+
+    assert emitted == []
+    assert scheduler._ReminderScheduler__timer.isActive()